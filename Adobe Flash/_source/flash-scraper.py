@@ -22,49 +22,57 @@
 from codecs import open
 from os import path
 import re
-import csv
 import os
 import argparse
-import datetime
+import sys
 
-from lxml.html.soupparser import fromstring
-from looseversion import LooseVersion
-import requests
-import pandas as pd
-import numpy as np
+sys.path.insert(0, path.abspath(path.join(path.dirname(path.abspath(__file__)), '..', '..')))
+from tpvh import fetch
+from tpvh import merge
+from tpvh import extract
+from tpvh import dates
+from tpvh import parsing
+from tpvh import table
+from tpvh import versionkey
+from tpvh import freeze
 
 # Globals
 VERSION = '1.2'
 TARGET = 'flash'
 
+P_VERSION_1 = re.compile(r'flash player (?P<version_full>[.0-9]*)', re.IGNORECASE)
+P_VERSION_2 = re.compile(r'flash player (?P<version_full_1>[.0-9]*)\s+and (?P<version_full_2>[.0-9]*)', re.IGNORECASE)
+P_DATE = re.compile(r'.*released (?P<date>.*)\)', re.IGNORECASE)
+
+XPATH_SNAPFILES_RELEASES = extract.XPath('.//*[@id="apphistory-container"]/h3')
+
 # Options definition
 parser = argparse.ArgumentParser(description="version: " + VERSION)
 parser.add_argument('-m', '--mode', help="Mode to choose: check against a previous provided file ('previous'), or 'standalone' scrape (default 'update')", choices = ['previous', 'standalone'], type = str.lower, default = 'previous')
 parser.add_argument('-p', '--previous-file', help='Path to previous file to take as a reference (default ../%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), '..', './%s.csv' % TARGET)))
 parser.add_argument('-o', '--output-file', help='Output csv file (default ./%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), './%s.csv' % TARGET)))
+parser.add_argument('-l', '--lean', help='Merge, sort and write the csv file without pandas, to the same bytes', action = 'store_true', default = False)
+parser.add_argument('--refresh-frozen', help='Fetch again the pages marked as frozen instead of reusing their persisted rows', action = 'store_true', default = False)
 
     
 def from_adobe():
-    root = fromstring(requests.get('https://helpx.adobe.com/flash-player/kb/archived-flash-player-versions.html').content)
-    
-    p_version_1 = re.compile(r'flash player (?P<version_full>[.0-9]*)', re.IGNORECASE)
-    p_version_2 = re.compile(r'flash player (?P<version_full_1>[.0-9]*)\s+and (?P<version_full_2>[.0-9]*)', re.IGNORECASE)
-    p_date = re.compile(r'.*released (?P<date>.*)\)', re.IGNORECASE)
+    # Flash Player reached its end of life in 2020, this archive will not change anymore
+    return fetch.scrape('https://helpx.adobe.com/flash-player/kb/archived-flash-player-versions.html', parse_adobe, frozen=True)
+
+def parse_adobe(content):
+    root = parsing.fromstring(content, './/li/a', '%s adobe' % TARGET)
     
-    trs = root.findall('.//li')
-    for entry in trs:
-        release = entry.xpath('string(a/text())')
-        date = entry.xpath('string(text())')
+    for entry in root.iter('li'):
+        release = extract.first_text(extract.child(entry, 'a'))
+        date = extract.first_text(entry)
         
-        date_entry = p_date.search(date)
-        version_1_entry = p_version_1.search(release)
-        version_2_entry = p_version_2.search(release)
+        date_entry = P_DATE.search(date)
+        version_1_entry = P_VERSION_1.search(release)
+        version_2_entry = P_VERSION_2.search(release)
         
         if date_entry and (version_1_entry or version_2_entry):
             flash = {}
-            format_str = '%m/%d/%Y'
-            datetime_obj = datetime.datetime.strptime(date_entry.group('date'), format_str)
-            flash['date'] = datetime_obj.date().isoformat()
+            flash['date'] = dates.iso(date_entry.group('date'), "%m/%d/%Y")
             
             if version_1_entry:
                 version_full = version_1_entry.group('version_full')
@@ -78,45 +86,27 @@ def from_adobe():
                 yield version_full_2, flash
 
 def from_snapfiles():
-    root = fromstring(requests.get('https://www.snapfiles.com/apphistory/flashplayer_history.html').content)
-    trs = root.findall('.//*[@id="apphistory-container"]/h3')
-    for entry in trs:
-        date = entry.xpath('string(span/text())')
-        release = entry.xpath('string(text())').strip()
+    return fetch.scrape('https://www.snapfiles.com/apphistory/flashplayer_history.html', parse_snapfiles, frozen=True)
+
+def parse_snapfiles(content):
+    root = parsing.fromstring(content, XPATH_SNAPFILES_RELEASES, '%s snapfiles' % TARGET)
+    for entry in XPATH_SNAPFILES_RELEASES(root):
+        date = extract.first_text(extract.child(entry, 'span'))
+        release = extract.first_text(entry).strip()
         
         if release and date:
             flash = {}
-            format_str = "%b %d, %Y"
-            datetime_obj = datetime.datetime.strptime(date, format_str)
-            flash['date'] = datetime_obj.date().isoformat()
+            flash['date'] = dates.iso(date, "%b %d, %Y")
         
             yield release, flash
     
 
-def scrape_and_merge(sources, results):
-    for name, source in sources:
-        count = 0
-        for version, item in source:
-            if version not in results['version_full'].values:
-                results.loc[len(results)] = [version, item['date']]
-                count = count + 1
-                
-        print("[+] %s entries collected from '%s'" % (count, name))
-    
 def scrape_and_generate_csv(opts):
-    results = pd.DataFrame(columns=['version_full', 'date (yyyy-mm-dd)'])
     sources = [ ('adobe', from_adobe()), 
                 ('snapfiles', from_snapfiles()) ]
     
-    scrape_and_merge(sources, results)
-    
-    if opts.mode == 'previous':
-        old_results = pd.read_csv(opts.previous_file, delimiter=';', quoting=csv.QUOTE_ALL, lineterminator='\n')
-        results_concat = pd.concat([old_results, results]).drop_duplicates(subset = 'version_full')
-        results = results_concat
-    
-    final_results = results.sort_values(by='version_full', key=np.vectorize(LooseVersion)).reset_index(drop=True)
-    final_results.to_csv(opts.output_file, sep=';', index=False, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    results = merge.scrape_and_merge(sources, ['version_full', 'date (yyyy-mm-dd)'])
+    table.generate_csv(opts, results, versionkey.scheme_of(TARGET))
     
     return
     
@@ -126,6 +116,8 @@ def main():
     """
     global parser
     options = parser.parse_args()
+    table.LEAN = table.LEAN or options.lean
+    freeze.REFRESH = options.refresh_frozen
     
     if options.mode == 'previous':
         if os.path.isfile(options.previous_file):
@@ -22,54 +22,65 @@
 from codecs import open
 from os import path
 import re
-import csv
 import os
 import argparse
-import datetime
+import sys
 
-from lxml.html.soupparser import fromstring
-from looseversion import LooseVersion
-import requests
-import pandas as pd
-import numpy as np
+sys.path.insert(0, path.abspath(path.join(path.dirname(path.abspath(__file__)), '..', '..')))
+from tpvh import fetch
+from tpvh import merge
+from tpvh import chocolatey
+from tpvh import extract
+from tpvh import dates
+from tpvh import parsing
+from tpvh import table
+from tpvh import versionkey
+from tpvh import incremental
 
 # Globals
 VERSION = '1.3'
 TARGET = 'reader'
 
+P_VERSION = re.compile(r'(?P<version>\d{2}\.[0-9.]*)', re.IGNORECASE)
+
 # Options definition
 parser = argparse.ArgumentParser(description="version: " + VERSION)
 parser.add_argument('-m', '--mode', help="Mode to choose: check against a previous provided file ('previous'), or 'standalone' scrape (default 'update')", choices = ['previous', 'standalone'], type = str.lower, default = 'previous')
 parser.add_argument('-p', '--previous-file', help='Path to previous file to take as a reference (default ../%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), '..', './%s.csv' % TARGET)))
 parser.add_argument('-o', '--output-file', help='Output csv file (default ./%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), './%s.csv' % TARGET)))
+parser.add_argument('-l', '--lean', help='Merge, sort and write the csv file without pandas, to the same bytes', action = 'store_true', default = False)
+parser.add_argument('-s', '--stop-after', help="In 'previous' mode, stop reading the chocolatey history after this number of consecutive known versions, 0 to read it all (default %d)" % incremental.STOP_AFTER, type = int, default = None)
 
     
 def from_adobe():
-    root = fromstring(requests.get('https://helpx.adobe.com/acrobat/release-note/release-notes-acrobat-reader.html').content)
-    trs = root.xpath(".//span[@class='std std-ref']/text()")
-    p_version = re.compile(r'(?P<version>\d{2}\.[0-9.]*)', re.IGNORECASE)
+    return fetch.scrape('https://helpx.adobe.com/acrobat/release-note/release-notes-acrobat-reader.html', parse_adobe, stream=True)
+
+def is_release_name(element):
+    return element.tag == 'span' and element.get('class') == 'std std-ref'
+
+def parse_adobe(content):
+    spans = parsing.iterparse(content, is_release_name, source='%s adobe' % TARGET)
     
-    for entry in trs:
+    for entry in ( text for span in spans for text in extract.texts(span) ):
         version_list = []
         
         if 'update, ' in entry:
             first_part, second_part = entry.split('update, ', maxsplit=1)
             
             reader = {}
-            try:
-                reader['date'] = datetime.datetime.strptime(second_part, "%b %d, %Y").date().isoformat()
-            except ValueError:
-                pass
+            date = dates.parse(second_part, "%b %d, %Y")
+            if date:
+                reader['date'] = date
             
             if reader:
                 if ',' in first_part:
                     for elem in first_part.split(', ', maxsplit=1):
-                        version_entry = p_version.search(elem)
+                        version_entry = P_VERSION.search(elem)
                         if version_entry:
                             version_list.append(version_entry.group('version'))
                 
                 else:
-                    version_entry = p_version.search(first_part)
+                    version_entry = P_VERSION.search(first_part)
                     if version_entry:
                         version_list.append(version_entry.group('version'))
                     
@@ -77,50 +88,12 @@ def from_adobe():
                     yield version, reader
     
 
-def from_chocolatey():
-    root = fromstring(requests.get('https://chocolatey.org/packages/adobereader-update').content)
-    trs = root.findall('.//tr')
-    p_version = re.compile(r'(?P<version>\d{2}\.[0-9.]*)', re.IGNORECASE)
-    
-    for entry in trs:
-        date = entry.xpath('string(td[4])').strip()
-        release = entry.xpath('string(td[2]/a|td[2]/span)')
-        
-        version_entry = p_version.search(release)
-        if version_entry and date:
-            release = version_entry.group('version')
-            
-            reader = {}
-            format_str = "%A, %B %d, %Y"
-            datetime_obj = datetime.datetime.strptime(date, format_str)
-            reader['date'] = datetime_obj.date().isoformat()
-        
-            yield release, reader
-    
-def scrape_and_merge(sources, results):
-    for name, source in sources:
-        count = 0
-        for version, item in source:
-            if version not in results['version_full'].values:
-                results.loc[len(results)] = [version, item['date']]
-                count = count + 1
-                
-        print("[+] %s entries collected from '%s'" % (count, name))
-    
 def scrape_and_generate_csv(opts):
-    results = pd.DataFrame(columns=['version_full', 'date (yyyy-mm-dd)'])
     sources = [ ('adobe', from_adobe()), 
-                ('chocolatey', from_chocolatey()) ]
-    
-    scrape_and_merge(sources, results)
-    
-    if opts.mode == 'previous':
-        old_results = pd.read_csv(opts.previous_file, delimiter=';', quoting=csv.QUOTE_ALL, lineterminator='\n')
-        results_concat = pd.concat([old_results, results]).drop_duplicates(subset = 'version_full')
-        results = results_concat
+                ('chocolatey', chocolatey.scrape(TARGET, incremental.known_versions(opts))) ]
     
-    final_results = results.sort_values(by='version_full', key=np.vectorize(LooseVersion)).reset_index(drop=True)
-    final_results.to_csv(opts.output_file, sep=';', index=False, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    results = merge.scrape_and_merge(sources, ['version_full', 'date (yyyy-mm-dd)'])
+    table.generate_csv(opts, results, versionkey.scheme_of(TARGET))
     
     return
     
@@ -130,6 +103,7 @@ def main():
     """
     global parser
     options = parser.parse_args()
+    table.LEAN = table.LEAN or options.lean
     
     if options.mode == 'previous':
         if os.path.isfile(options.previous_file):
@@ -22,70 +22,58 @@
 from codecs import open
 from os import path
 import re
-import csv
 import os
 import argparse
-import datetime
+import sys
 
-from lxml.html.soupparser import fromstring
-from looseversion import LooseVersion
-import requests
-import pandas as pd
-import numpy as np
+sys.path.insert(0, path.abspath(path.join(path.dirname(path.abspath(__file__)), '..', '..')))
+from tpvh import fetch
+from tpvh import merge
+from tpvh import extract
+from tpvh import dates
+from tpvh import parsing
+from tpvh import table
+from tpvh import versionkey
 
 # Globals
 VERSION = '1.1'
 TARGET = 'apache'
 
+P_VERSION = re.compile(r'(apache_|httpd-)(?P<version>\d\.\d.\d{1,2})\.[^\d]*', re.IGNORECASE)
+
+XPATH_ARCHIVES = extract.XPath('.//a[starts-with(@href, "apache_") or starts-with(@href, "httpd-")]')
+
 # Options definition
 parser = argparse.ArgumentParser(description="version: " + VERSION)
 parser.add_argument('-m', '--mode', help="Mode to choose: check against a previous provided file ('previous'), or 'standalone' scrape (default 'update')", choices = ['previous', 'standalone'], type = str.lower, default = 'previous')
 parser.add_argument('-p', '--previous-file', help='Path to previous file to take as a reference (default ../%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), '..', './%s.csv' % TARGET)))
 parser.add_argument('-o', '--output-file', help='Output csv file (default ./%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), './%s.csv' % TARGET)))
+parser.add_argument('-l', '--lean', help='Merge, sort and write the csv file without pandas, to the same bytes', action = 'store_true', default = False)
 
 def from_apache():
-    root = fromstring(requests.get('https://archive.apache.org/dist/httpd/').content)
-    trs = root.xpath('.//a[starts-with(@href, "apache_") or starts-with(@href, "httpd-")]')
+    return fetch.scrape('https://archive.apache.org/dist/httpd/', parse_apache)
+
+def parse_apache(content):
+    root = parsing.fromstring(content, XPATH_ARCHIVES, '%s apache' % TARGET)
     
-    p_version = re.compile(r'(apache_|httpd-)(?P<version>\d\.\d.\d{1,2})\.[^\d]*', re.IGNORECASE)
-    for entry in trs:
+    for entry in XPATH_ARCHIVES(root):
         release = entry.text
         date = entry.tail.strip().rsplit(' ',1)[0].strip()
         
-        version_entry = p_version.search(release)
+        version_entry = P_VERSION.search(release)
         if version_entry and date:
             release = version_entry.group('version')
             
             apache = {}
-            format_str = "%Y-%m-%d %H:%M"
-            datetime_obj = datetime.datetime.strptime(date, format_str)
-            apache['date'] = datetime_obj.date().isoformat()
+            apache['date'] = dates.iso(date, "%Y-%m-%d %H:%M")
             
             yield release, apache
 
-def scrape_and_merge(sources, results):
-    for name, source in sources:
-        count = 0
-        for version, item in source:
-            if version not in results['version_full'].values:
-                results.loc[len(results)] = [version, item['date']]
-                count = count + 1
-                
-        print("[+] %s entries collected from '%s'" % (count, name))
-    
 def scrape_and_generate_csv(opts):
-    results = pd.DataFrame(columns=['version_full', 'date (yyyy-mm-dd)'])
     sources = [('apache', from_apache())]
     
-    scrape_and_merge(sources, results)
-    
-    if opts.mode == 'previous':
-        old_results = pd.read_csv(opts.previous_file, delimiter=';', quoting=csv.QUOTE_ALL, lineterminator='\n')
-        results_concat = pd.concat([old_results, results]).drop_duplicates(subset = 'version_full')
-        results = results_concat
-    
-    final_results = results.sort_values(by='version_full', key=np.vectorize(LooseVersion)).reset_index(drop=True)
-    final_results.to_csv(opts.output_file, sep=';', index=False, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    results = merge.scrape_and_merge(sources, ['version_full', 'date (yyyy-mm-dd)'])
+    table.generate_csv(opts, results, versionkey.scheme_of(TARGET))
     
     return
     
@@ -95,6 +83,7 @@ def main():
     """
     global parser
     options = parser.parse_args()
+    table.LEAN = table.LEAN or options.lean
     
     if options.mode == 'previous':
         if os.path.isfile(options.previous_file):
@@ -23,98 +23,88 @@ from codecs import open
 from os import path
 from urllib.parse import urljoin
 import re
-import csv
 import os
 import argparse
-import datetime
+import sys
 
-from lxml.html.soupparser import fromstring
-from looseversion import LooseVersion
-import requests
-import pandas as pd
-import numpy as np
+sys.path.insert(0, path.abspath(path.join(path.dirname(path.abspath(__file__)), '..', '..')))
+from tpvh import fetch
+from tpvh import merge
+from tpvh import chocolatey
+from tpvh import extract
+from tpvh import dates
+from tpvh import parsing
+from tpvh import table
+from tpvh import versionkey
+from tpvh import freeze
+from tpvh import incremental
 
 # Globals
 VERSION = '1.1'
 TARGET = 'tomcat'
 
+# Majors older than this one are end of life, their archive directories will not change anymore
+MAJOR_FIRST_ACTIVE = 9
+
+P_MAJOR = re.compile(r'tomcat-(?P<major>\d+)/?$', re.IGNORECASE)
+P_VERSION = re.compile(r'v(?P<version>\d{1,2}\..*)\/', re.IGNORECASE)
+
+XPATH_MAJORS = extract.XPath('.//a[contains(@href, "tomcat-")]')
+XPATH_RELEASES = extract.XPath('.//a[starts-with(@href, "v")]')
+
 # Options definition
 parser = argparse.ArgumentParser(description="version: " + VERSION)
 parser.add_argument('-m', '--mode', help="Mode to choose: check against a previous provided file ('previous'), or 'standalone' scrape (default 'update')", choices = ['previous', 'standalone'], type = str.lower, default = 'previous')
 parser.add_argument('-p', '--previous-file', help='Path to previous file to take as a reference (default ../%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), '..', './%s.csv' % TARGET)))
 parser.add_argument('-o', '--output-file', help='Output csv file (default ./%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), './%s.csv' % TARGET)))
+parser.add_argument('-l', '--lean', help='Merge, sort and write the csv file without pandas, to the same bytes', action = 'store_true', default = False)
+parser.add_argument('-s', '--stop-after', help="In 'previous' mode, stop reading the chocolatey history after this number of consecutive known versions, 0 to read it all (default %d)" % incremental.STOP_AFTER, type = int, default = None)
+parser.add_argument('--refresh-frozen', help='Fetch again the pages marked as frozen instead of reusing their persisted rows', action = 'store_true', default = False)
 
     
 def from_apache():
     base_url = 'https://archive.apache.org/dist/tomcat/'
-    base_root = fromstring(requests.get(base_url).content)
-    base_trs = base_root.xpath('.//a[contains(@href, "tomcat-")]')
+    base_response = fetch.get(base_url)
+    base_root = parsing.fromstring(base_response.content, XPATH_MAJORS, '%s apache' % TARGET)
     
-    for base_entry in base_trs:
-        current_link = urljoin(base_url, base_entry.text)
-        root = fromstring(requests.get(current_link).content)
-        trs = root.xpath('.//a[starts-with(@href, "v")]')
-        
-        p_version = re.compile(r'v(?P<version>\d{1,2}\..*)\/', re.IGNORECASE)
-        for entry in trs:
-            release = entry.text
-            date = entry.tail.strip().rstrip('-').strip()
-            
-            version_entry = p_version.search(release)
-            if version_entry and date:
-                release = version_entry.group('version')
-                
-                tomcat = {}
-                format_str = "%Y-%m-%d %H:%M"
-                datetime_obj = datetime.datetime.strptime(date, format_str)
-                tomcat['date'] = datetime_obj.date().isoformat()
-            
-                yield release, tomcat
+    links = [ urljoin(base_url, base_entry.text) for base_entry in XPATH_MAJORS(base_root) ]
+    
+    # the majors of an index that did not come back fine are not to be trusted
+    links_frozen = []
+    if base_response.status_code == 200:
+        for link in links:
+            major_entry = P_MAJOR.search(link)
+            if major_entry and int(major_entry.group('major')) < MAJOR_FIRST_ACTIVE:
+                links_frozen.append(link)
+    else:
+        print('[!] "%s" answered %d, no listing frozen' % (base_url, base_response.status_code))
+    
+    # every listing is fetched at once, the ones of inactive majors only the first time,
+    # and only frozen when they come back fine with releases (see 'tpvh.freeze.store')
+    yield from fetch.scrape(links, parse_apache, frozen=links_frozen)
 
-def from_chocolatey():
-    root = fromstring(requests.get('https://chocolatey.org/packages/Tomcat').content)
-    trs = root.findall('.//tr')
-    p_version = re.compile(r'(?P<version>\d{1,2}\..*)', re.IGNORECASE)
+def parse_apache(content):
+    root = parsing.fromstring(content, XPATH_RELEASES, '%s apache' % TARGET)
     
-    for entry in trs:
-        date = entry.xpath('string(td[4])').strip()
-        release = entry.xpath('string(td[2]/a|td[2]/span)')
+    for entry in XPATH_RELEASES(root):
+        release = entry.text
+        date = entry.tail.strip().rstrip('-').strip()
         
-        version_entry = p_version.search(release)
+        version_entry = P_VERSION.search(release)
         if version_entry and date:
             release = version_entry.group('version')
             
             tomcat = {}
-            format_str = "%A, %B %d, %Y"
-            datetime_obj = datetime.datetime.strptime(date, format_str)
-            tomcat['date'] = datetime_obj.date().isoformat()
+            tomcat['date'] = dates.iso(date, "%Y-%m-%d %H:%M")
         
             yield release, tomcat
-    
-def scrape_and_merge(sources, results):
-    for name, source in sources:
-        count = 0
-        for version, item in source:
-            if version not in results['version_full'].values:
-                results.loc[len(results)] = [version, item['date']]
-                count = count + 1
-                
-        print("[+] %s entries collected from '%s'" % (count, name))
-    
+
 def scrape_and_generate_csv(opts):
-    results = pd.DataFrame(columns=['version_full', 'date (yyyy-mm-dd)'])
     sources = [ ('apache', from_apache()), 
-                ('chocolatey', from_chocolatey()) ]
-    
-    scrape_and_merge(sources, results)
-    
-    if opts.mode == 'previous':
-        old_results = pd.read_csv(opts.previous_file, delimiter=';', quoting=csv.QUOTE_ALL, lineterminator='\n')
-        results_concat = pd.concat([old_results, results]).drop_duplicates(subset = 'version_full')
-        results = results_concat
+                ('chocolatey', chocolatey.scrape(TARGET, incremental.known_versions(opts))) ]
     
-    final_results = results.sort_values(by='version_full', key=np.vectorize(LooseVersion)).reset_index(drop=True)
-    final_results.to_csv(opts.output_file, sep=';', index=False, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    results = merge.scrape_and_merge(sources, ['version_full', 'date (yyyy-mm-dd)'])
+    table.generate_csv(opts, results, versionkey.scheme_of(TARGET))
     
     return
     
@@ -124,6 +114,8 @@ def main():
     """
     global parser
     options = parser.parse_args()
+    table.LEAN = table.LEAN or options.lean
+    freeze.REFRESH = options.refresh_frozen
     
     if options.mode == 'previous':
         if os.path.isfile(options.previous_file):
@@ -22,99 +22,63 @@
 from codecs import open
 from os import path
 import re
-import csv
 import os
 import argparse
-import datetime
+import sys
 
-from lxml.html.soupparser import fromstring
-from looseversion import LooseVersion
-import requests
-import pandas as pd
-import numpy as np
+sys.path.insert(0, path.abspath(path.join(path.dirname(path.abspath(__file__)), '..', '..')))
+from tpvh import fetch
+from tpvh import merge
+from tpvh import chocolatey
+from tpvh import extract
+from tpvh import dates
+from tpvh import parsing
+from tpvh import table
+from tpvh import versionkey
+from tpvh import incremental
 
 # Globals
 VERSION = '1.2'
 TARGET = 'clamav'
 
+P_VERSION = re.compile(r'clamav-(?P<version>\d{1,2}\..*)\.tar\.gz$', re.IGNORECASE)
+
 # Options definition
 parser = argparse.ArgumentParser(description="version: " + VERSION)
 parser.add_argument('-m', '--mode', help="Mode to choose: check against a previous provided file ('previous'), or 'standalone' scrape (default 'update')", choices = ['previous', 'standalone'], type = str.lower, default = 'previous')
 parser.add_argument('-p', '--previous-file', help='Path to previous file to take as a reference (default ../%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), '..', './%s.csv' % TARGET)))
 parser.add_argument('-o', '--output-file', help='Output csv file (default ./%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), './%s.csv' % TARGET)))
-
-def remove_control_chars(content):
-    return re.sub(u'[^\u0020-\uD7FF\u0009\u000A\u000D\uE000-\uFFFD\U00010000-\U0010FFFF]+', '', content)
+parser.add_argument('-l', '--lean', help='Merge, sort and write the csv file without pandas, to the same bytes', action = 'store_true', default = False)
+parser.add_argument('-s', '--stop-after', help="In 'previous' mode, stop reading the chocolatey history after this number of consecutive known versions, 0 to read it all (default %d)" % incremental.STOP_AFTER, type = int, default = None)
 
 def from_clamav():
     urls = ['https://www.clamav.net/downloads', 'https://www.clamav.net/previous_stable_releases']
     
-    # specifying headers to bypass Cloudflare protection
-    headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36"}
-    for url in urls:
-        root = fromstring(requests.get(url, headers=headers).content)
-        trs = root.findall('.//tr')
-        p_version = re.compile(r'clamav-(?P<version>\d{1,2}\..*)\.tar\.gz$', re.IGNORECASE)
-        
-        for entry in trs:
-            date = entry.xpath('string(td[2])').strip()
-            release = entry.xpath('string(td[1])').strip()
-            
-            version_entry = p_version.search(release)
-            if version_entry and date:
-                release = version_entry.group('version')
-                
-                element = {}
-                format_str = "%Y-%m-%d %H:%M:%S UTC"
-                datetime_obj = datetime.datetime.strptime(date, format_str)
-                element['date'] = datetime_obj.date().isoformat()
-            
-                yield release, element
+    # the shared session already sends browser headers to bypass Cloudflare protection
+    return fetch.scrape(urls, parse_clamav)
 
-def from_chocolatey():
-    root = fromstring(remove_control_chars(requests.get('https://chocolatey.org/packages/clamav').content.decode('utf-8')))
-    trs = root.findall('.//tr')
-    p_version = re.compile(r'(?P<version>\d{1,2}\..*)', re.IGNORECASE)
-    
-    for entry in trs:
-        date = entry.xpath('string(td[4])').strip()
-        release = entry.xpath('string(td[2]/a|td[2]/span)')
+def parse_clamav(content):
+    root = parsing.fromstring(content, './/tr[td[2]]', '%s clamav' % TARGET)
+    for entry in root.iter('tr'):
+        name, date = extract.cells(entry, 2)
+        release = extract.string(name).strip()
+        date = extract.string(date).strip()
         
-        version_entry = p_version.search(release)
+        version_entry = P_VERSION.search(release)
         if version_entry and date:
             release = version_entry.group('version')
             
             element = {}
-            format_str = "%A, %B %d, %Y"
-            datetime_obj = datetime.datetime.strptime(date, format_str)
-            element['date'] = datetime_obj.date().isoformat()
+            element['date'] = dates.iso(date, "%Y-%m-%d %H:%M:%S UTC")
         
             yield release, element
-    
-def scrape_and_merge(sources, results):
-    for name, source in sources:
-        count = 0
-        for version, item in source:
-            if version not in results['version_full'].values:
-                results.loc[len(results)] = [version, item['date']]
-                count = count + 1
-                
-        print("[+] %s entries collected from '%s'" % (count, name))
-    
+
 def scrape_and_generate_csv(opts):
-    results = pd.DataFrame(columns=['version_full', 'date (yyyy-mm-dd)'])
     sources = [ ('clamav', from_clamav()), 
-                ('chocolatey', from_chocolatey()) ]
-    
-    scrape_and_merge(sources, results)
-    
-    if opts.mode == 'previous':
-        old_results = pd.read_csv(opts.previous_file, delimiter=';', quoting=csv.QUOTE_ALL, lineterminator='\n')
-        results_concat = pd.concat([old_results, results]).drop_duplicates(subset = 'version_full')
-        results = results_concat
+                ('chocolatey', chocolatey.scrape(TARGET, incremental.known_versions(opts))) ]
     
-    final_results = results.sort_values(by='version_full', key=np.vectorize(LooseVersion)).reset_index(drop=True)
-    final_results.to_csv(opts.output_file, sep=';', index=False, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    results = merge.scrape_and_merge(sources, ['version_full', 'date (yyyy-mm-dd)'])
+    table.generate_csv(opts, results, versionkey.scheme_of(TARGET))
     
     return
 
@@ -124,6 +88,7 @@ def main():
     """
     global parser
     options = parser.parse_args()
+    table.LEAN = table.LEAN or options.lean
     
     if options.mode == 'previous':
         if os.path.isfile(options.previous_file):
@@ -23,126 +23,96 @@ from codecs import open
 from os import path
 from urllib.parse import urljoin
 import re
-import csv
 import os
 import argparse
-import datetime
-import functools
-import requests
-import types
-import concurrent.futures
-
-from lxml.html.soupparser import fromstring
-#from looseversion import LooseVersion
-from distutils.version import LooseVersion
-from packaging import version
-import requests
-import pandas as pd
-import numpy as np
+import sys
+
+sys.path.insert(0, path.abspath(path.join(path.dirname(path.abspath(__file__)), '..', '..')))
+from tpvh import fetch
+from tpvh import merge
+from tpvh import extract
+from tpvh import dates
+from tpvh import parsing
+from tpvh import table
+from tpvh import versionkey
+from tpvh import freeze
 
 # Globals
 VERSION = '1.1'
 TARGET = 'drupal'
 
+P_RELEASE_AND_DATE = re.compile(r'Drupal (?P<version>\d{1,2}\..*), (?P<date>[\d]{4}-[\d]{2}-[\d]{2})$', re.IGNORECASE)
+P_VERSION = re.compile(r'(?P<version>\d{1,2}\..*)$', re.IGNORECASE)
+
+XPATH_RELEASE_NODES = extract.XPath('.//div[contains(@class,"node-project-release")]')
+XPATH_RELEASE_LINK = extract.XPath('string(h2/a/@href)')
+XPATH_RELEASES = extract.XPath('.//div[contains(@class, "item-list")]/ul/li')
+
 # Options definition
 parser = argparse.ArgumentParser(description="version: " + VERSION)
 parser.add_argument('-m', '--mode', help="Mode to choose: check against a previous provided file ('previous'), or 'standalone' scrape (default 'update')", choices = ['previous', 'standalone'], type = str.lower, default = 'previous')
 parser.add_argument('-p', '--previous-file', help='Path to previous file to take as a reference (default ../%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), '..', './%s.csv' % TARGET)))
 parser.add_argument('-o', '--output-file', help='Output csv file (default ./%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), './%s.csv' % TARGET)))
+parser.add_argument('-l', '--lean', help='Merge, sort and write the csv file without pandas, to the same bytes', action = 'store_true', default = False)
+parser.add_argument('--refresh-frozen', help='Fetch again the pages marked as frozen instead of reusing their persisted rows', action = 'store_true', default = False)
 
 def from_drupal_old_releases():
     url_old_release = 'https://www.drupal.org/docs/8/understanding-drupal-version-numbers/drupal-release-history'
-    root = fromstring(requests.get(url_old_release).content)
-    trs = root.findall('.//p')
-    p_release_and_date = re.compile(r'Drupal (?P<version>\d{1,2}\..*), (?P<date>[\d]{4}-[\d]{2}-[\d]{2})$', re.IGNORECASE)
-    for entry in trs:
-        date = entry.xpath('string(td[2])').strip()
-        release = entry.xpath('string(td[1])').strip()
-        
-        release_and_date = p_release_and_date.search(entry.text)
+    # the history of Drupal 1 to 6 will not change anymore
+    return fetch.scrape(url_old_release, parse_drupal_old_releases, frozen=True)
+
+def parse_drupal_old_releases(content):
+    root = parsing.fromstring(content, './/p', '%s drupal_old_releases' % TARGET)
+    for entry in root.iter('p'):
+        release_and_date = P_RELEASE_AND_DATE.search(entry.text)
         if release_and_date:
             release = release_and_date.group('version')
             
             drupal = {}
-            format_str = "%Y-%m-%d"
-            datetime_obj = datetime.datetime.strptime(release_and_date.group('date'), format_str)
-            drupal['date'] = datetime_obj.date().isoformat()
+            drupal['date'] = dates.iso(release_and_date.group('date'), "%Y-%m-%d")
             
             yield release, drupal
 
-def from_drupal_new_releases_enum(target):
-    page_url = 'https://www.drupal.org/project/drupal/releases?version=%d' % target
-    root = fromstring(requests.get(page_url).content)
+def release_page_url(content):
+    root = parsing.fromstring(content, XPATH_RELEASE_NODES, '%s drupal_new_releases_enum' % TARGET)
 
-    div = root.xpath('.//div[contains(@class,"node-project-release")]')
+    div = XPATH_RELEASE_NODES(root)
     root_entry = div[0]
     
-    p_version = re.compile(r'(?P<version>\d{1,2}\..*)$', re.IGNORECASE)
-    page_url_version = urljoin('https://www.drupal.org/project/', root_entry.xpath('string(h2/a/@href)'))
-    root_version = fromstring(requests.get(page_url_version).content)
+    return urljoin('https://www.drupal.org/project/', XPATH_RELEASE_LINK(root_entry))
+
+def parse_drupal_new_releases(content):
+    root_version = parsing.fromstring(content, XPATH_RELEASES, '%s drupal_new_releases' % TARGET)
     
-    entry_version = root_version.xpath('.//div[contains(@class, "item-list")]/ul/li')
-    for entry in entry_version:
-        release = entry.xpath('string(span[1]/span/a)')
-        date = entry.xpath('string(span[2]/span)')
+    for entry in XPATH_RELEASES(root_version):
+        name, date = extract.cells(entry, 2, 'span')
+        release = extract.string(extract.child(extract.child(name, 'span'), 'a'))
+        date = extract.string(extract.child(date, 'span'))
     
-        version_entry = p_version.search(release)
+        version_entry = P_VERSION.search(release)
         if version_entry and date:
             release = version_entry.group('version')
             
             drupal = {}
-            format_str = "%d %B %Y"
-            datetime_obj = datetime.datetime.strptime(date, format_str)
-            drupal['date'] = datetime_obj.date().isoformat()
+            drupal['date'] = dates.iso(date, "%d %B %Y")
             
             yield release, drupal
 
 def from_drupal_new_releases():
-    base_url = 'https://www.drupal.org/project/drupal/releases'
-    root = fromstring(requests.get(base_url).content)
-    
     targets = range(7,11)
+    index_urls = [ 'https://www.drupal.org/project/drupal/releases?version=%d' % target for target in targets ]
     
-    # enum each version page
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        futs = [ ("Drupal releases version %s" % target, executor.submit(functools.partial(from_drupal_new_releases_enum, target)))
-                 for target in targets ]
-    
-        return futs
-
-def scrape_and_merge(sources, results):
-    for name, source in sources:
-        count = 0
-        if isinstance(source, types.GeneratorType):
-            for version, item in source:
-                if version not in results['version_full'].values and not('x-dev' in version):
-                    results.loc[len(results)] = [version, item['date']]
-                    count = count + 1
-                
-            print("[+] %s entries collected from '%s'" % (count, name))
-        
-        if isinstance(source, concurrent.futures._base.Future):
-            for version, item in source.result():
-                if version not in results['version_full'].values and not('x-dev' in version):
-                    results.loc[len(results)] = [version, item['date']]
-                    count = count + 1
-                
-            print("[+] %s entries collected from '%s'" % (count, name))
+    # the release index of every version is fetched at once, then all their release pages
+    release_urls = [ release_page_url(response.content) for url, response in fetch.fetch_all(index_urls) ]
     
+    yield from fetch.scrape(release_urls, parse_drupal_new_releases)
+
 def scrape_and_generate_csv(opts):
-    results = pd.DataFrame(columns=['version_full', 'date (yyyy-mm-dd)'])
-    sources = [ ('drupal_old', from_drupal_old_releases()) ]
-    sources = sources + from_drupal_new_releases()
-    
-    scrape_and_merge(sources, results)
-    
-    if opts.mode == 'previous':
-        old_results = pd.read_csv(opts.previous_file, delimiter=';', quoting=csv.QUOTE_ALL, lineterminator='\n')
-        results_concat = pd.concat([old_results, results]).drop_duplicates(subset = 'version_full')
-        results = results_concat
+    sources = [ ('drupal_old', from_drupal_old_releases()),
+                ('drupal_new', from_drupal_new_releases()) ]
     
-    final_results = results.sort_values(by='version_full', key=np.vectorize(version.parse)).reset_index(drop=True)
-    final_results.to_csv(opts.output_file, sep=';', index=False, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    results = merge.scrape_and_merge(sources, ['version_full', 'date (yyyy-mm-dd)'], accept=lambda version: not('x-dev' in version))
+    table.generate_csv(opts, results, versionkey.scheme_of(TARGET))
     
     return
 
@@ -153,6 +123,8 @@ def main():
     """
     global parser
     options = parser.parse_args()
+    table.LEAN = table.LEAN or options.lean
+    freeze.REFRESH = options.refresh_frozen
     
     if options.mode == 'previous':
         if os.path.isfile(options.previous_file):
@@ -22,39 +22,43 @@
 from codecs import open
 from os import path
 import re
-import csv
 import os
 import argparse
-import datetime
+import sys
 
-from lxml.html.soupparser import fromstring
-from looseversion import LooseVersion
-import requests
-import pandas as pd
-import numpy as np
+sys.path.insert(0, path.abspath(path.join(path.dirname(path.abspath(__file__)), '..', '..')))
+from tpvh import fetch
+from tpvh import merge
+from tpvh import chocolatey
+from tpvh import extract
+from tpvh import parsing
+from tpvh import table
+from tpvh import versionkey
+from tpvh import incremental
 
 # Globals
 VERSION = '1.4'
 TARGET = 'java'
 
+P_JAVA_UNTIL_9 = re.compile(r'java se (?P<version_major>\d*) update (?P<version_minor>.*)', re.IGNORECASE)
+P_JAVA_9_PLUS = re.compile(r'java se (?P<version_major>\d*?)\.(?P<version_minor>.*)', re.IGNORECASE)
+
 # Options definition
 parser = argparse.ArgumentParser(description="version: " + VERSION)
 parser.add_argument('-m', '--mode', help="Mode to choose: check against a previous provided file ('previous'), or 'standalone' scrape (default 'previous')", choices = ['previous', 'standalone'], type = str.lower, default = 'previous')
 parser.add_argument('-p', '--previous-file', help='Path to previous file to take as a reference (default ../%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), '..', './%s.csv' % TARGET)))
 parser.add_argument('-o', '--output-file', help='Output csv file (default ./%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), './%s.csv' % TARGET)))
+parser.add_argument('-l', '--lean', help='Merge, sort and write the csv file without pandas, to the same bytes', action = 'store_true', default = False)
+parser.add_argument('-s', '--stop-after', help="In 'previous' mode, stop reading the chocolatey history after this number of consecutive known versions, 0 to read it all (default %d)" % incremental.STOP_AFTER, type = int, default = None)
 
 def from_wikipedia():
-    root = fromstring(requests.get('https://en.wikipedia.org/wiki/Java_version_history').content)
-    
-    p_java_until_9 = re.compile(r'java se (?P<version_major>\d*) update (?P<version_minor>.*)', re.IGNORECASE)
-    p_java_9_plus = re.compile(r'java se (?P<version_major>\d*?)\.(?P<version_minor>.*)', re.IGNORECASE)
-    
-    trs = root.findall('.//tbody/tr')
-    for entry in trs:
-        release = entry.xpath('string(td[1]/text())')
-        date = entry.xpath('string(td[2]/text())')
+    return fetch.scrape('https://en.wikipedia.org/wiki/Java_version_history', parse_wikipedia, stream=True)
+
+def parse_wikipedia(content):
+    for entry in parsing.iterparse(content, extract.is_tbody_row, extract.has_cell, '%s wikipedia' % TARGET):
+        release, date = [ extract.first_text(cell) for cell in extract.cells(entry, 2) ]
         
-        java_entry = p_java_until_9.search(release)
+        java_entry = P_JAVA_UNTIL_9.search(release)
         if java_entry and not "+" in java_entry.group('version_minor').strip():
             java = {}
             version_full = "1.%s.0_%s" % (java_entry.group('version_major').strip(), java_entry.group('version_minor').strip())
@@ -62,7 +66,7 @@ def from_wikipedia():
             java['date'] = date.strip()
             yield version_full, java
             
-        java_entry = p_java_9_plus.search(release)
+        java_entry = P_JAVA_9_PLUS.search(release)
         if java_entry and not "+" in java_entry.group('version_minor').strip():
             java = {}
             version_full = "1.%s.%s" % (java_entry.group('version_major').strip(), java_entry.group('version_minor').strip().replace('.','_', 1))
@@ -70,59 +74,12 @@ def from_wikipedia():
             java['date'] = date.strip()
             yield version_full, java
 
-def from_chocolatey():
-    urls = [ 'https://community.chocolatey.org/packages/oraclejdk',
-             'https://community.chocolatey.org/packages/jre8',
-             'https://community.chocolatey.org/packages/corretto11jdk',
-             'https://community.chocolatey.org/packages/openjdk11',
-           ]
-    for url in urls:
-        root = fromstring(requests.get(url).content)
-        trs = root.findall('.//tr')
-        p_version = re.compile(r'(?P<version_major>\d{1,2}?)\.(?P<version_0>.)\.(?P<version_minor>.*)', re.IGNORECASE)
-        
-        for entry in trs:
-            date = entry.xpath('string(td[4])').strip()
-            release = entry.xpath('string(td[2]/a|td[2]/span)')
-            
-            
-            version_entry = p_version.search(release)
-            if version_entry and date:
-                release = "1.%s.%s_%s" % (version_entry.group('version_major').strip(),version_entry.group('version_0').strip() , version_entry.group('version_minor').strip())
-                
-                java = {}
-                format_str = "%A, %B %d, %Y"
-                datetime_obj = datetime.datetime.strptime(date, format_str)
-                java['date'] = datetime_obj.date().isoformat()
-                java['version_major'] = version_entry.group('version_major')
-            
-                yield release, java
-
-def scrape_and_merge(sources, results):
-    for name, source in sources:
-        count = 0
-        for version, item in source:
-            #print(version, source)
-            if version not in results['version_full'].values:
-                results.loc[len(results)] = [version, item['version_major'], item['date']]
-                count = count + 1
-                
-        print("[+] %s entries collected from '%s'" % (count, name))
-    
 def scrape_and_generate_csv(opts):
-    results = pd.DataFrame(columns=['version_full', 'version_major', 'date (yyyy-mm-dd)'])
     sources = [ ('wikipedia', from_wikipedia()), 
-                ('chocolatey', from_chocolatey()) ]
-    
-    scrape_and_merge(sources, results)
-    
-    if opts.mode == 'previous':
-        old_results = pd.read_csv(opts.previous_file, delimiter=';', quoting=csv.QUOTE_ALL, lineterminator='\n')
-        results_concat = pd.concat([old_results, results]).drop_duplicates(subset = 'version_full')
-        results = results_concat
+                ('chocolatey', chocolatey.scrape(TARGET, incremental.known_versions(opts))) ]
     
-    final_results = results.sort_values(by='version_full', key=np.vectorize(LooseVersion)).reset_index(drop=True)
-    final_results.to_csv(opts.output_file, sep=';', index=False, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    results = merge.scrape_and_merge(sources, ['version_full', 'version_major', 'date (yyyy-mm-dd)'])
+    table.generate_csv(opts, results, versionkey.scheme_of(TARGET))
     
     return
     
@@ -132,6 +89,7 @@ def main():
     """
     global parser
     options = parser.parse_args()
+    table.LEAN = table.LEAN or options.lean
     
     if options.mode == 'previous':
         if os.path.isfile(options.previous_file):
@@ -21,42 +21,43 @@
 
 from codecs import open
 from os import path
-import re
-import csv
 import os
 import argparse
-import datetime
+import sys
 
-from lxml.html.soupparser import fromstring
-from looseversion import LooseVersion
-import requests
-import pandas as pd
-import numpy as np
+sys.path.insert(0, path.abspath(path.join(path.dirname(path.abspath(__file__)), '..', '..')))
+from tpvh import fetch
+from tpvh import merge
+from tpvh import extract
+from tpvh import dates
+from tpvh import parsing
+from tpvh import table
+from tpvh import versionkey
 
 # Globals
 VERSION = '1.1'
 TARGET = 'exchange'
 
+DATE_FORMATS = ('%B %d, %Y', '%B,%Y')
+
 # Options definition
 parser = argparse.ArgumentParser(description="version: " + VERSION)
 parser.add_argument('-m', '--mode', help="Mode to choose: check against a previous provided file ('previous'), or 'standalone' scrape (default 'update')", choices = ['previous', 'standalone'], type = str.lower, default = 'previous')
 parser.add_argument('-p', '--previous-file', help='Path to previous file to take as a reference (default ../%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), '..', './%s.csv' % TARGET)))
 parser.add_argument('-o', '--output-file', help='Output csv file (default ./%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), './%s.csv' % TARGET)))
+parser.add_argument('-l', '--lean', help='Merge, sort and write the csv file without pandas, to the same bytes', action = 'store_true', default = False)
 
 def from_buildnumbers():
-    root = fromstring(requests.get('https://buildnumbers.wordpress.com/exchange/').content)
-    trs = root.findall('.//tr')
+    return fetch.scrape('https://buildnumbers.wordpress.com/exchange/', parse_buildnumbers)
+
+def parse_buildnumbers(content):
+    root = parsing.fromstring(content, './/tr[td[3]]', '%s buildnumbers' % TARGET)
     
-    for entry in trs:
-        version = entry.xpath('string(td[1])').strip()
-        description = entry.xpath('string(td[2])').strip()
+    for entry in root.iter('tr'):
+        version, description, date = [ extract.string(cell).strip() for cell in extract.cells(entry, 3) ]
         
-        date = entry.xpath('string(td[3])').strip()
-        try:
-            format_str = "%Y %B %d"
-            datetime_obj = datetime.datetime.strptime(date, format_str)
-            date = datetime_obj.date().isoformat()
-        except ValueError:
+        date = dates.parse(date, "%Y %B %d")
+        if date is None:
             continue
         
         if version and description and date:
@@ -82,22 +83,16 @@ def from_buildnumbers():
                 yield version_full, exchange
 
 def from_microsoft():
-    root = fromstring(requests.get('https://docs.microsoft.com/en-US/exchange/new-features/build-numbers-and-release-dates').content)
-    trs = root.findall('.//tr')
+    return fetch.scrape('https://docs.microsoft.com/en-US/exchange/new-features/build-numbers-and-release-dates', parse_microsoft)
+
+def parse_microsoft(content):
+    root = parsing.fromstring(content, './/tr[td[3]]', '%s microsoft' % TARGET)
     
-    for entry in trs:
-        description = entry.xpath('string(td[1])')
-        
-        date = entry.xpath('string(td[2])')
-        for fmt in ('%B %d, %Y', '%B,%Y'):
-            try:
-                datetime_obj = datetime.datetime.strptime(date, fmt)
-                date = datetime_obj.date().isoformat()
-            except ValueError:
-                pass
+    for entry in root.iter('tr'):
+        description, date, version_short, version_full = [ extract.string(cell) for cell in extract.cells(entry, 4) ]
         
-        version_short = entry.xpath('string(td[3])')
-        version_full = entry.xpath('string(td[4])')
+        # dates in another format are kept as they are
+        date = dates.parse(date, DATE_FORMATS, '%s microsoft' % TARGET) or date
         
         if description and date and ((version_short and version_full) or (version_short and not(version_full))):
             exchange = {}
@@ -110,30 +105,12 @@ def from_microsoft():
             else:
                 yield version_full, exchange
     
-def scrape_and_merge(sources, results):
-    for name, source in sources:
-        count = 0
-        for version, item in source:
-            if version not in results['version_full'].values:
-                results.loc[len(results)] = [version, item['version_short'], item['description'], item['date']]
-                count = count + 1
-                
-        print("[+] %s entries collected from '%s'" % (count, name))
-    
 def scrape_and_generate_csv(opts):
-    results = pd.DataFrame(columns=['version_full', 'version_short', 'description', 'date (yyyy-mm-dd)'])
     sources = [ ('microsoft', from_microsoft()),
                 ('buildnumbers', from_buildnumbers()) ]
     
-    scrape_and_merge(sources, results)
-    
-    if opts.mode == 'previous':
-        old_results = pd.read_csv(opts.previous_file, delimiter=';', quoting=csv.QUOTE_ALL, lineterminator='\n')
-        results_concat = pd.concat([old_results, results]).drop_duplicates(subset = 'version_full')
-        results = results_concat
-    
-    final_results = results.sort_values(by='version_full', key=np.vectorize(LooseVersion)).reset_index(drop=True)
-    final_results.to_csv(opts.output_file, sep=';', index=False, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    results = merge.scrape_and_merge(sources, ['version_full', 'version_short', 'description', 'date (yyyy-mm-dd)'])
+    table.generate_csv(opts, results, versionkey.scheme_of(TARGET))
     
     return
 
@@ -144,6 +121,7 @@ def main():
     """
     global parser
     options = parser.parse_args()
+    table.LEAN = table.LEAN or options.lean
     
     if options.mode == 'previous':
         if os.path.isfile(options.previous_file):
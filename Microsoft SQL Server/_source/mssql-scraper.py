@@ -21,19 +21,18 @@
 
 from codecs import open
 from os import path
-import re
 import csv
 import os
 import argparse
-import datetime
+import sys
 import codecs
 
-from contextlib import closing
-from lxml.html.soupparser import fromstring
-from looseversion import LooseVersion
-import requests
-import pandas as pd
-import numpy as np
+sys.path.insert(0, path.abspath(path.join(path.dirname(path.abspath(__file__)), '..', '..')))
+from tpvh import fetch
+from tpvh import merge
+from tpvh import dates
+from tpvh import table
+from tpvh import versionkey
 
 # Globals
 VERSION = '1.1'
@@ -44,46 +43,31 @@ parser = argparse.ArgumentParser(description="version: " + VERSION)
 parser.add_argument('-m', '--mode', help="Mode to choose: check against a previous provided file ('previous'), or 'standalone' scrape (default 'update')", choices = ['previous', 'standalone'], type = str.lower, default = 'previous')
 parser.add_argument('-p', '--previous-file', help='Path to previous file to take as a reference (default ../%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), '..', './%s.csv' % TARGET)))
 parser.add_argument('-o', '--output-file', help='Output csv file (default ./%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), './%s.csv' % TARGET)))
+parser.add_argument('-l', '--lean', help='Merge, sort and write the csv file without pandas, to the same bytes', action = 'store_true', default = False)
 
 def from_sqlserverbuilds():
     url = 'https://docs.google.com/spreadsheets/d/16Ymdz80xlCzb6CwRFVokwo0onkofVYFoSkc7mYe6pgw/export?gid=0&format=csv'
-    with closing(requests.get(url, stream=True)) as r:
-        spamreader = csv.DictReader(codecs.iterdecode(r.iter_lines(), 'utf-8'))
-        for row in spamreader:
-            mssql = {}
-            date = ''
-            if row['ReleaseDate']:
-                datetime_obj = datetime.datetime.strptime(row['ReleaseDate'], "%Y-%m-%d")
-                date = datetime_obj.date().isoformat()
-            
-            mssql['date'] = date
-            mssql['description'] = row['Description']
-            
-            yield row['Build'], mssql
+    return fetch.scrape(url, parse_sqlserverbuilds)
+
+def parse_sqlserverbuilds(content):
+    rows = list(csv.DictReader(codecs.iterdecode(content.splitlines(), 'utf-8')))
+    release_dates = dates.column([ row['ReleaseDate'] for row in rows ], "%Y-%m-%d")
     
-def scrape_and_merge(sources, results):
-    for name, source in sources:
-        count = 0
-        for version, item in source:
-            if version not in results['version_full'].values:
-                results.loc[len(results)] = [version, item['description'], item['date']]
-                count = count + 1
-                
-        print("[+] %s entries collected from '%s'" % (count, name))
+    for row, date in zip(rows, release_dates):
+        if row['ReleaseDate'] and date is None:
+            raise ValueError("unexpected release date '%s' for build '%s'" % (row['ReleaseDate'], row['Build']))
+        
+        mssql = {}
+        mssql['date'] = date or ''
+        mssql['description'] = row['Description']
+        
+        yield row['Build'], mssql
     
 def scrape_and_generate_csv(opts):
-    results = pd.DataFrame(columns=['version_full', 'description', 'date (yyyy-mm-dd)'])
     sources = [ ('sqlserverbuilds', from_sqlserverbuilds()) ]
     
-    scrape_and_merge(sources, results)
-    
-    if opts.mode == 'previous':
-        old_results = pd.read_csv(opts.previous_file, delimiter=';', quoting=csv.QUOTE_ALL, lineterminator='\n')
-        results_concat = pd.concat([old_results, results]).drop_duplicates(subset = 'version_full')
-        results = results_concat
-    
-    final_results = results.sort_values(by='version_full', key=np.vectorize(LooseVersion)).reset_index(drop=True)
-    final_results.to_csv(opts.output_file, sep=';', index=False, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    results = merge.scrape_and_merge(sources, ['version_full', 'description', 'date (yyyy-mm-dd)'])
+    table.generate_csv(opts, results, versionkey.scheme_of(TARGET))
     
     return
 
@@ -94,6 +78,7 @@ def main():
     """
     global parser
     options = parser.parse_args()
+    table.LEAN = table.LEAN or options.lean
     
     if options.mode == 'previous':
         if os.path.isfile(options.previous_file):
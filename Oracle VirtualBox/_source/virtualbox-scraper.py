@@ -22,107 +22,80 @@
 from codecs import open
 from os import path
 import re
-import csv
 import os
 import argparse
-import datetime
+import sys
 
-from lxml.html.soupparser import fromstring
-from looseversion import LooseVersion
-import requests
-import pandas as pd
-import numpy as np
+sys.path.insert(0, path.abspath(path.join(path.dirname(path.abspath(__file__)), '..', '..')))
+from tpvh import fetch
+from tpvh import merge
+from tpvh import chocolatey
+from tpvh import extract
+from tpvh import dates
+from tpvh import parsing
+from tpvh import table
+from tpvh import versionkey
+from tpvh import freeze
+from tpvh import incremental
 
 # Globals
 VERSION = '1.2'
 TARGET = 'virtualbox'
 
+P_VERSION_AND_DATE = re.compile(r'VirtualBox (?P<version>(\d{1,2}\.?){3}) \(released\s(?P<date>.*?)\)', re.IGNORECASE)
+
+DATE_FORMATS = ('%B %d %Y', '%Y-%m-%d')
+
 # Options definition
 parser = argparse.ArgumentParser(description="version: " + VERSION)
 parser.add_argument('-m', '--mode', help="Mode to choose: check against a previous provided file ('previous'), or 'standalone' scrape (default 'update')", choices = ['previous', 'standalone'], type = str.lower, default = 'previous')
 parser.add_argument('-p', '--previous-file', help='Path to previous file to take as a reference (default ../%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), '..', './%s.csv' % TARGET)))
 parser.add_argument('-o', '--output-file', help='Output csv file (default ./%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), './%s.csv' % TARGET)))
+parser.add_argument('-l', '--lean', help='Merge, sort and write the csv file without pandas, to the same bytes', action = 'store_true', default = False)
+parser.add_argument('-s', '--stop-after', help="In 'previous' mode, stop reading the chocolatey history after this number of consecutive known versions, 0 to read it all (default %d)" % incremental.STOP_AFTER, type = int, default = None)
+parser.add_argument('--refresh-frozen', help='Fetch again the pages marked as frozen instead of reusing their persisted rows', action = 'store_true', default = False)
 
 def from_virtualbox():
     urls = ['https://www.virtualbox.org/wiki/Changelog',
             'https://www.virtualbox.org/wiki/Changelog-7.0',
-            'https://www.virtualbox.org/wiki/Changelog-6.1',
-           'https://www.virtualbox.org/wiki/Changelog-6.0',
-           'https://www.virtualbox.org/wiki/Changelog-5.2',
-           'https://www.virtualbox.org/wiki/Changelog-5.1',
-           'https://www.virtualbox.org/wiki/Changelog-5.0',
-           'https://www.virtualbox.org/wiki/Changelog-4.3',
-           'https://www.virtualbox.org/wiki/Changelog-4.2',
-           'https://www.virtualbox.org/wiki/Changelog-4.1',
-           'https://www.virtualbox.org/wiki/Changelog-4.0']
+            'https://www.virtualbox.org/wiki/Changelog-6.1']
     
-    for url in urls:
-        root = fromstring(requests.get(url).content)
-        trs = root.xpath('.//p')
-        
-        p_version_and_date = re.compile(r'VirtualBox (?P<version>(\d{1,2}\.?){3}) \(released\s(?P<date>.*?)\)', re.IGNORECASE)
-        for entry in trs:
-            
-            version_and_date = p_version_and_date.search(entry.text_content())
-            if version_and_date:
-                release = version_and_date.group('version')
-                date = version_and_date.group('date')
-                
-                element = {}
-                for fmt in ('%B %d %Y', '%Y-%m-%d'):
-                    try:
-                        datetime_obj = datetime.datetime.strptime(date, fmt)
-                    except ValueError:
-                        pass
-                
-                element['date'] = datetime_obj.date().isoformat()
-            
-                yield release, element
+    # these branches are end of life, their changelogs will not change anymore
+    urls_frozen = ['https://www.virtualbox.org/wiki/Changelog-6.0',
+                   'https://www.virtualbox.org/wiki/Changelog-5.2',
+                   'https://www.virtualbox.org/wiki/Changelog-5.1',
+                   'https://www.virtualbox.org/wiki/Changelog-5.0',
+                   'https://www.virtualbox.org/wiki/Changelog-4.3',
+                   'https://www.virtualbox.org/wiki/Changelog-4.2',
+                   'https://www.virtualbox.org/wiki/Changelog-4.1',
+                   'https://www.virtualbox.org/wiki/Changelog-4.0']
+    
+    return fetch.scrape(urls + urls_frozen, parse_virtualbox, frozen=urls_frozen)
 
-def from_chocolatey():
-    root = fromstring(requests.get('https://chocolatey.org/packages/virtualbox').content)
-    trs = root.findall('.//tr')
-    p_version = re.compile(r'(?P<version>\d{1,2}\..*)', re.IGNORECASE)
+def parse_virtualbox(content):
+    root = parsing.fromstring(content, './/p', '%s virtualbox' % TARGET)
     
-    for entry in trs:
-        date = entry.xpath('string(td[4])').strip()
-        release = entry.xpath('string(td[2]/a|td[2]/span)')
-        
-        version_entry = p_version.search(release)
-        if version_entry and date:
-            release = version_entry.group('version')
+    for entry in root.iter('p'):
+        version_and_date = P_VERSION_AND_DATE.search(extract.string(entry))
+        if version_and_date:
+            release = version_and_date.group('version')
+            date = version_and_date.group('date')
+            
+            date = dates.parse(date, DATE_FORMATS, '%s virtualbox' % TARGET)
+            if date is None:
+                continue
             
             element = {}
-            format_str = "%A, %B %d, %Y"
-            datetime_obj = datetime.datetime.strptime(date, format_str)
-            element['date'] = datetime_obj.date().isoformat()
+            element['date'] = date
         
             yield release, element
-    
-def scrape_and_merge(sources, results):
-    for name, source in sources:
-        count = 0
-        for version, item in source:
-            if version not in results['version_full'].values:
-                results.loc[len(results)] = [version, item['date']]
-                count = count + 1
-                
-        print("[+] %s entries collected from '%s'" % (count, name))
-    
+
 def scrape_and_generate_csv(opts):
-    results = pd.DataFrame(columns=['version_full', 'date (yyyy-mm-dd)'])
     sources = [ ('virtualbox', from_virtualbox()),
-                ('chocolatey', from_chocolatey()) ]
-    
-    scrape_and_merge(sources, results)
-    
-    if opts.mode == 'previous':
-        old_results = pd.read_csv(opts.previous_file, delimiter=';', quoting=csv.QUOTE_ALL, lineterminator='\n')
-        results_concat = pd.concat([old_results, results]).drop_duplicates(subset = 'version_full')
-        results = results_concat
+                ('chocolatey', chocolatey.scrape(TARGET, incremental.known_versions(opts))) ]
     
-    final_results = results.sort_values(by='version_full', key=np.vectorize(LooseVersion)).reset_index(drop=True)
-    final_results.to_csv(opts.output_file, sep=';', index=False, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    results = merge.scrape_and_merge(sources, ['version_full', 'date (yyyy-mm-dd)'])
+    table.generate_csv(opts, results, versionkey.scheme_of(TARGET))
     
     return
 
@@ -132,6 +105,8 @@ def main():
     """
     global parser
     options = parser.parse_args()
+    table.LEAN = table.LEAN or options.lean
+    freeze.REFRESH = options.refresh_frozen
     
     if options.mode == 'previous':
         if os.path.isfile(options.previous_file):
@@ -22,17 +22,21 @@
 from codecs import open
 from os import path
 import re
-import csv
 import os
 import argparse
-import datetime
+import sys
 
-from lxml.html.soupparser import fromstring
-from packaging import version
-import requests
 
-import pandas as pd
-import numpy as np
+sys.path.insert(0, path.abspath(path.join(path.dirname(path.abspath(__file__)), '..', '..')))
+from tpvh import fetch
+from tpvh import merge
+from tpvh import chocolatey
+from tpvh import extract
+from tpvh import dates
+from tpvh import parsing
+from tpvh import table
+from tpvh import versionkey
+from tpvh import incremental
 
 import pprint
 
@@ -40,78 +44,41 @@ import pprint
 VERSION = '1.0'
 TARGET = 'postgres'
 
+P_VERSION_AND_DATE = re.compile(r'^(?P<version>\d{1,2}\..*) \((?P<date>[\d]{4}-[\d]{2}-[\d]{2})\)$', re.IGNORECASE)
+
 # Options definition
 parser = argparse.ArgumentParser(description="version: " + VERSION)
 parser.add_argument('-m', '--mode', help="Mode to choose: check against a previous provided file ('previous'), or 'standalone' scrape (default 'update')", choices = ['previous', 'standalone'], type = str.lower, default = 'previous')
 parser.add_argument('-p', '--previous-file', help='Path to previous file to take as a reference (default ../%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), '..', './%s.csv' % TARGET)))
 parser.add_argument('-o', '--output-file', help='Output csv file (default ./%s.csv)' % TARGET, default=path.abspath(path.join(os.getcwd(), './%s.csv' % TARGET)))
-
-def from_chocolatey():
-    root = fromstring(requests.get('https://chocolatey.org/packages/postgresql').content)
-    trs = root.findall('.//tr')
-    p_version = re.compile(r'(?P<version>\d{1,2}\..*)', re.IGNORECASE)
-    
-    for entry in trs:
-        date = entry.xpath('string(td[4])').strip()
-        release = entry.xpath('string(td[2]/a|td[2]/span)')
-        
-        version_entry = p_version.search(release)
-        if version_entry and date:
-            release = version_entry.group('version')
-            
-            postgres = {}
-            format_str = "%A, %B %d, %Y"
-            datetime_obj = datetime.datetime.strptime(date, format_str)
-            postgres['date'] = datetime_obj.date().isoformat()
-        
-            yield release, postgres
+parser.add_argument('-l', '--lean', help='Merge, sort and write the csv file without pandas, to the same bytes', action = 'store_true', default = False)
+parser.add_argument('-s', '--stop-after', help="In 'previous' mode, stop reading the chocolatey history after this number of consecutive known versions, 0 to read it all (default %d)" % incremental.STOP_AFTER, type = int, default = None)
 
 def from_bucardo():
-    root = fromstring(requests.get('https://bucardo.org/postgres_all_versions.html').content)
-    trs = root.findall('.//td')
-    p_version_and_date = re.compile(r'^(?P<version>\d{1,2}\..*) \((?P<date>[\d]{4}-[\d]{2}-[\d]{2})\)$', re.IGNORECASE)
+    return fetch.scrape('https://bucardo.org/postgres_all_versions.html', parse_bucardo)
+
+def parse_bucardo(content):
+    root = parsing.fromstring(content, './/td', '%s bucardo' % TARGET)
     
-    for entries in trs:
-        entries = entries.text_content().splitlines()
+    for entries in root.iter('td'):
+        entries = extract.string(entries).splitlines()
         for entry in entries:
-            version_and_date = p_version_and_date.search(entry)
+            version_and_date = P_VERSION_AND_DATE.search(entry)
             if version_and_date:
                 release = version_and_date.group('version')
                 date = version_and_date.group('date')
                 
                 postgres = {}
-                format_str = "%Y-%m-%d"
-                datetime_obj = datetime.datetime.strptime(date, format_str)
-                postgres['date'] = datetime_obj.date().isoformat()
+                postgres['date'] = dates.iso(date, "%Y-%m-%d")
             
                 yield release, postgres
 
-def scrape_and_merge(sources, results):
-    for name, source in sources:
-        count = 0
-        for version, item in source:
-            if version not in results['version_full'].values:
-                results.loc[len(results)] = [version, item['date']]
-                count = count + 1
-        
-        print("[+] %s entries collected from '%s'" % (count, name))
-
-    
 def scrape_and_generate_csv(opts):
-    results = pd.DataFrame(columns=['version_full', 'date (yyyy-mm-dd)'])
-
-    sources = [ ('chocolatey', from_chocolatey()),
+    sources = [ ('chocolatey', chocolatey.scrape(TARGET, incremental.known_versions(opts))),
                 ('bucardo', from_bucardo())]
     
-    scrape_and_merge(sources, results)
-    
-    if opts.mode == 'previous':
-        old_results = pd.read_csv(opts.previous_file, delimiter=';', quoting=csv.QUOTE_ALL, lineterminator='\n')
-        results_concat = pd.concat([old_results, results]).drop_duplicates(subset = 'version_full')
-        results = results_concat
-    
-    final_results = results.sort_values(by='version_full', key=np.vectorize(version.parse)).reset_index(drop=True)
-    final_results.to_csv(opts.output_file, sep=';', index=False, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    results = merge.scrape_and_merge(sources, ['version_full', 'date (yyyy-mm-dd)'])
+    table.generate_csv(opts, results, versionkey.scheme_of(TARGET))
     
     return
 
@@ -121,6 +88,7 @@ def main():
     """
     global parser
     options = parser.parse_args()
+    table.LEAN = table.LEAN or options.lean
     
     if options.mode == 'previous':
         if os.path.isfile(options.previous_file):
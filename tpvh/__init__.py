@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    Shared helpers for the third-parties-version-history scrapers
+"""
+
+from os import path
+
+VERSION = '1.0'
+
+# Repository root, every product lives in its own directory under it
+ROOT_DIR = path.abspath(path.join(path.dirname(__file__), '..'))
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    On-disk cache of HTTP validators (ETag / Last-Modified) and of the rows parsed from each page
+
+    When a page comes back '304 Not Modified', or with the very same body as last time
+    for servers without validators, the rows extracted from it last time are reused as
+    is and the page is not parsed again. Rows are stored per parser, keyed on
+    the parser name and on a hash of the file defining it, so editing a scraper
+    invalidates the rows it produced.
+
+    Pages cut short by 'tpvh.incremental' get their validators stored too, with the
+    rows read before the stop marked as partial: they are only reused by callers
+    that stop at known versions as well, the rest of the page being known to them.
+"""
+
+from os import path
+import os
+import json
+import stat
+import hashlib
+import tempfile
+import functools
+import threading
+
+from tpvh import ROOT_DIR
+
+# Where the cache lives, 'TPVH_CACHE_DIR' overrides it, 'TPVH_CACHE_DIR=' disables it
+CACHE_DIR = os.environ.get('TPVH_CACHE_DIR', path.join(ROOT_DIR, '.cache', 'http'))
+
+# os.umask can only be read by setting it, which is done once here, before any thread writes files
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+_file_hashes = {}
+_stats = { 'not_modified': 0, 'modified': 0 }
+_lock = threading.Lock()
+
+def enabled():
+    return bool(CACHE_DIR)
+
+def entry_path(url):
+    return path.join(CACHE_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+def parser_parts(parse):
+    """
+        (function, arguments) of a parser, a function or a 'functools.partial' of one
+    """
+    if isinstance(parse, functools.partial):
+        return parse.func, parse.args
+
+    return parse, ()
+
+def parser_key(parse):
+    """
+        Identify a parser by its name, its arguments and the content of the file defining it
+    """
+    function, args = parser_parts(parse)
+    filename = function.__code__.co_filename
+    with _lock:
+        if filename not in _file_hashes:
+            try:
+                with open(filename, 'rb') as fd:
+                    _file_hashes[filename] = hashlib.sha1(fd.read()).hexdigest()
+            except OSError:
+                _file_hashes[filename] = hashlib.sha1(function.__code__.co_code).hexdigest()
+
+        name = '_'.join([ function.__qualname__ ] + [ str(arg) for arg in args ])
+        return '%s:%s' % (name, _file_hashes[filename])
+
+def load(url):
+    """
+        Return the cache entry of 'url', or None
+    """
+    if not(enabled()):
+        return None
+
+    try:
+        with open(entry_path(url), 'r', encoding='utf-8') as fd:
+            entry = json.load(fd)
+    except (OSError, ValueError):
+        return None
+
+    return entry if entry.get('url') == url else None
+
+def validators(entry):
+    """
+        Conditional headers to send for a cached entry
+    """
+    headers = {}
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+
+    return headers
+
+def body_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+def same_body(entry, content):
+    """
+        Whether 'content' is the body the rows of 'entry' were extracted from
+    """
+    return bool(entry) and entry.get('sha256') == body_hash(content)
+
+def cached_rows(entry, parse, partial=False):
+    """
+        Rows that 'parse' extracted the last time the page of 'entry' was fetched, or None
+
+        Rows of a page cut short are only returned with 'partial'.
+    """
+    if entry is None:
+        return None
+
+    key = parser_key(parse)
+    if key in entry.get('partial', []) and not(partial):
+        return None
+
+    rows = entry.get('rows', {}).get(key)
+    return [ tuple(row) for row in rows ] if rows is not None else None
+
+def store(url, response, parse, rows, entry=None, digest=None, partial=False):
+    """
+        Remember the validators of 'response' and the rows 'parse' extracted from it
+
+        'digest' is the sha256 of the body of a streamed response, whose content is gone,
+        None when it was not read to the end. 'partial' marks rows of a page cut short.
+    """
+    if not(enabled()):
+        return
+
+    if response.status_code != 200:
+        return
+
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if digest is None and not(partial):
+        digest = body_hash(response.content)
+
+    # rows of the other parsers of this page are only valid for the same version of the page
+    previous = entry or {}
+    if digest is None or previous.get('sha256') != digest:
+        previous = {}
+
+    key = parser_key(parse)
+    new_entry = { 'url': url, 'etag': etag, 'last_modified': last_modified, 'sha256': digest, 'rows': dict(previous.get('rows', {})),
+                  'partial': [ other for other in previous.get('partial', []) if other != key ] }
+    new_entry['rows'][key] = [ list(row) for row in rows ]
+    if partial:
+        new_entry['partial'].append(key)
+
+    write_json(entry_path(url), new_entry)
+
+def write_file(filename, content):
+    """
+        Write the bytes 'content' to 'filename' through a temporary file, so that readers never see half of it
+
+        The file keeps its mode when it exists, and otherwise gets the one 'open' would give it.
+    """
+    os.makedirs(path.dirname(filename), exist_ok=True)
+    try:
+        mode = stat.S_IMODE(os.stat(filename).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~UMASK
+
+    fd, tmp = tempfile.mkstemp(dir=path.dirname(filename), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(content)
+        os.chmod(tmp, mode)
+        os.replace(tmp, filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def write_json(filename, content):
+    write_file(filename, json.dumps(content).encode('utf-8'))
+
+def count(not_modified):
+    with _lock:
+        _stats['not_modified' if not_modified else 'modified'] += 1
+
+def report():
+    with _lock:
+        if not(enabled()) or not(any(_stats.values())):
+            return []
+
+        return [ '[+] http cache: %d pages unchanged, %d pages parsed' % (_stats['not_modified'], _stats['modified']) ]
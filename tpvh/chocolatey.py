@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+    Version histories of the chocolatey packages of the products
+
+    Chocolatey package pages all list the versions of a package, newest first, with
+    their date in the same table. A product is registered in 'PACKAGES' with its
+    package slugs, the pattern of the versions in the release names and the
+    transform of a match into the version (and any other column); every product
+    then goes through the same fetch and parse path, 'scrape'. Pages are streamed, so
+    that in 'previous' mode the download stops with the first run of known versions.
+"""
+
+import re
+import functools
+import collections
+
+from tpvh import dates
+from tpvh import extract
+from tpvh import fetch
+from tpvh import parsing
+
+# chocolatey.org/packages/<slug> redirects here
+URL = 'https://community.chocolatey.org/packages/%s'
+
+Package = collections.namedtuple('Package', ['slugs', 'pattern', 'transform'])
+
+P_VERSION_1_DIGIT = re.compile(r'(?P<version>\d{1}\.[0-9.]*)', re.IGNORECASE)
+P_VERSION_2_DIGITS = re.compile(r'(?P<version>\d{2}\.[0-9.]*)', re.IGNORECASE)
+P_VERSION_3_DIGITS = re.compile(r'(?P<version>\d{1,3}\.[0-9.]*)', re.IGNORECASE)
+P_JAVA_VERSION = re.compile(r'(?P<version_major>\d{1,2}?)\.(?P<version_0>.)\.(?P<version_minor>.*)', re.IGNORECASE)
+
+def version(version_entry, item):
+    return version_entry.group('version')
+
+def java_version(version_entry, item):
+    item['version_major'] = version_entry.group('version_major')
+    return "1.%s.%s_%s" % (version_entry.group('version_major').strip(), version_entry.group('version_0').strip(), version_entry.group('version_minor').strip())
+
+# target: package slugs, version pattern, version transform
+PACKAGES = {
+    '7-zip':        Package(['7zip'], extract.P_VERSION, version),
+    'chrome':       Package(['GoogleChrome'], P_VERSION_3_DIGITS, version),
+    'clamav':       Package(['clamav'], extract.P_VERSION, version),
+    'edge':         Package(['microsoft-edge'], P_VERSION_3_DIGITS, version),
+    'firefox':      Package(['Firefox'], P_VERSION_3_DIGITS, version),
+    'horizonview':  Package(['vmware-horizon-client'], P_VERSION_1_DIGIT, version),
+    'java':         Package(['oraclejdk', 'jre8', 'corretto11jdk', 'openjdk11'], P_JAVA_VERSION, java_version),
+    'jetty':        Package(['jetty'], extract.P_VERSION, version),
+    'mariadb':      Package(['mariadb'], extract.P_VERSION, version),
+    'mongodb':      Package(['mongodb'], extract.P_VERSION, version),
+    'mremoteng':    Package(['mRemoteNG'], P_VERSION_1_DIGIT, version),
+    'mysql':        Package(['mysql'], extract.P_VERSION, version),
+    'nginx':        Package(['nginx'], extract.P_VERSION, version),
+    'php':          Package(['php'], extract.P_VERSION, version),
+    'postgres':     Package(['postgresql'], extract.P_VERSION, version),
+    'putty':        Package(['putty'], P_VERSION_1_DIGIT, version),
+    'reader':       Package(['adobereader-update'], P_VERSION_2_DIGITS, version),
+    'tomcat':       Package(['Tomcat'], extract.P_VERSION, version),
+    'virtualbox':   Package(['virtualbox'], extract.P_VERSION, version),
+    'vlc':          Package(['vlc'], extract.P_VERSION, version),
+    'winscp':       Package(['winscp'], extract.P_VERSION, version),
+    'workstation':  Package(['vmwareworkstation'], extract.P_VERSION, version),
+}
+
+_parsers = {}
+
+def parse(target, content):
+    """
+        (version, item) rows of a chocolatey page of 'target'
+    """
+    package = PACKAGES[target]
+    source = '%s chocolatey' % target
+
+    for row in parsing.iterparse(extract.sanitize(content), extract.is_row, extract.has_chocolatey_cells, source):
+        release, date = extract.chocolatey_row(row)
+        version_entry = package.pattern.search(release)
+        if version_entry and date:
+            item = {}
+            item['date'] = dates.iso(date, dates.CHOCOLATEY, source)
+            release = package.transform(version_entry, item)
+
+            yield release, item
+
+def parser(target):
+    """
+        Parser of the chocolatey pages of 'target'
+
+        A partial of the module level 'parse', which a parse worker finds again by its name.
+    """
+    if target not in _parsers:
+        _parsers[target] = functools.partial(parse, target)
+
+    return _parsers[target]
+
+def scrape(target, known=None):
+    """
+        Rows of all the chocolatey packages of 'target', see 'tpvh.fetch.scrape'
+    """
+    package = PACKAGES[target]
+    return fetch.scrape([ URL % slug for slug in package.slugs ], parser(target), known=known, stream=True)
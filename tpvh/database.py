@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+    SQLite database of all the product histories, kept in sync with the csv files
+
+    With 'DATABASE' set ('--database' or 'TPVH_DATABASE'), every csv file generated is
+    also loaded in the 'releases' table: a row per (product, version_full) with the
+    version key packed as a BLOB (see 'tpvh.versionkey.PACKED', bytes compare like the
+    versions), the date, and the other columns of the product, added as they show up.
+    The (product, version_key) and (product, date) indexes turn point and range lookups
+    into indexed queries. A product is only read again when its file changed, and then
+    only its new, changed or removed rows are written.
+"""
+
+import os
+import re
+import json
+import sqlite3
+import threading
+
+from tpvh import merge
+from tpvh import table
+from tpvh import versionkey
+
+# Database file, '' to leave it alone
+DATABASE = os.environ.get('TPVH_DATABASE', '')
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS releases (
+        product TEXT NOT NULL,
+        version_full TEXT NOT NULL,
+        version_key BLOB NOT NULL,
+        date TEXT,
+        PRIMARY KEY (product, version_full)
+    );
+    CREATE INDEX IF NOT EXISTS releases_version_key ON releases (product, version_key);
+    CREATE INDEX IF NOT EXISTS releases_date ON releases (product, date);
+    CREATE TABLE IF NOT EXISTS products (
+        product TEXT PRIMARY KEY,
+        scheme TEXT NOT NULL,
+        columns TEXT NOT NULL,
+        sha256 TEXT NOT NULL
+    );
+"""
+
+# Columns of the csv files other than version_full and date become columns of 'releases'
+P_COLUMN = re.compile(r'^[a-z_][a-z0-9_]*$')
+
+_stats = { 'products': 0, 'written': 0, 'deleted': 0 }
+_lock = threading.Lock()
+
+def enabled():
+    return bool(DATABASE)
+
+def connect(filename=None):
+    """
+        Connection to the database 'filename' (default 'DATABASE'), created if needed
+    """
+    db = sqlite3.connect(filename or DATABASE)
+    db.row_factory = sqlite3.Row
+    # readers are not blocked while the scrapers write
+    db.execute('PRAGMA journal_mode=WAL')
+    db.executescript(SCHEMA)
+
+    return db
+
+def column_name(column):
+    """
+        Name in 'releases' of the csv 'column'
+    """
+    if column == merge.VERSION_COLUMN:
+        return 'version_full'
+    if column == merge.DATE_COLUMN:
+        return 'date'
+    if not(P_COLUMN.match(column)):
+        raise ValueError('[!] column "%s" cannot be stored in the database' % column)
+
+    return column
+
+def add_columns(db, columns):
+    present = set(row['name'] for row in db.execute('PRAGMA table_info(releases)'))
+    for column in columns:
+        if column not in present:
+            db.execute('ALTER TABLE releases ADD COLUMN "%s" TEXT' % column)
+
+def sync(product, filename, scheme):
+    """
+        Load the generated csv 'filename' of 'product' into the database, return the (written, deleted) row counts
+    """
+    digest = table.file_hash(filename)
+    if digest is None:
+        return 0, 0
+
+    with _lock:
+        db = connect()
+        try:
+            with db:
+                known = db.execute('SELECT scheme, sha256 FROM products WHERE product = ?', (product,)).fetchone()
+                if known is not None and tuple(known) == (scheme, digest):
+                    return 0, 0
+
+                header, rows = table.read_csv(filename)
+                columns = [ column_name(column) for column in header ]
+                add_columns(db, columns)
+
+                version_index = columns.index('version_full')
+                date_index = columns.index('date') if 'date' in columns else None
+                for row in rows:
+                    if date_index is not None and row[date_index] == '':
+                        row[date_index] = None
+
+                # unchanged rows are left alone, all of them being rewritten if the scheme changed
+                selected = ', '.join('"%s"' % column for column in columns)
+                existing = { row['version_full']: tuple(row)[1:] for row in db.execute('SELECT version_full, %s FROM releases WHERE product = ?' % selected, (product,)) }
+                rescheme = known is not None and known['scheme'] != scheme
+                changed = [ row for row in rows if rescheme or existing.get(row[version_index]) != tuple(row) ]
+                removed = set(existing) - set(row[version_index] for row in rows)
+
+                keys = versionkey.packed_keys([ row[version_index] for row in changed ], scheme)
+                assignments = ', '.join('"%s" = excluded."%s"' % (column, column) for column in columns + [ 'version_key' ] if column != 'version_full')
+                db.executemany('INSERT INTO releases (product, version_key, %s) VALUES (?, ?, %s) ON CONFLICT (product, version_full) DO UPDATE SET %s'
+                               % (selected, ', '.join('?' * len(columns)), assignments),
+                               [ [ product, key ] + row for key, row in zip(keys, changed) ])
+                db.executemany('DELETE FROM releases WHERE product = ? AND version_full = ?', [ (product, version) for version in removed ])
+                db.execute('INSERT OR REPLACE INTO products (product, scheme, columns, sha256) VALUES (?, ?, ?, ?)', (product, scheme, json.dumps(columns), digest))
+        finally:
+            db.close()
+
+        _stats['products'] += 1
+        _stats['written'] += len(changed)
+        _stats['deleted'] += len(removed)
+
+    return len(changed), len(removed)
+
+def release(db, product, version):
+    """
+        Row of 'version' of 'product', None if it is unknown
+    """
+    return db.execute('SELECT * FROM releases WHERE product = ? AND version_full = ?', (product, version)).fetchone()
+
+def released_between(db, product, start, end):
+    """
+        Rows of 'product' released from the date 'start' to the date 'end' included, oldest first
+    """
+    return db.execute('SELECT * FROM releases WHERE product = ? AND date BETWEEN ? AND ? ORDER BY date', (product, start, end)).fetchall()
+
+def versions_between(db, product, low, high):
+    """
+        Rows of 'product' from version 'low' to version 'high' included, in version order
+
+        Empty for a bound that the scheme of the product cannot read (e.g. pep440).
+    """
+    known = db.execute('SELECT scheme FROM products WHERE product = ?', (product,)).fetchone()
+    if known is None:
+        return []
+
+    # queries are kept out of the memo of 'tpvh.versionkey', which is saved with the keys of the histories
+    key_function = versionkey.KEY_FUNCTIONS[known['scheme']]
+    try:
+        low_key, high_key = [ versionkey.PACKED.pack(*key_function(bound)) for bound in (low, high) ]
+    except ValueError:
+        return []
+
+    return db.execute('SELECT * FROM releases WHERE product = ? AND version_key BETWEEN ? AND ? ORDER BY version_key', (product, low_key, high_key)).fetchall()
+
+def report():
+    with _lock:
+        if not(_stats['products']):
+            return []
+
+        return [ '[+] database "%s": %d products updated, %d rows written, %d deleted' % (DATABASE, _stats['products'], _stats['written'], _stats['deleted']) ]
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+    Memoized conversion of the dates found in pages to ISO 'yyyy-mm-dd'
+
+    The same few thousand date strings come back on every run (every chocolatey page
+    lists its whole history), and some sources have to probe several formats per
+    row. Every (formats, raw string) pair is converted once per run, and for each
+    source the format that matched last is tried first, so that probing with
+    'strptime' and its ValueError only happens when a page changes its date style.
+    The formats of a source must not be ambiguous, their order only matters for speed.
+"""
+
+import datetime
+import threading
+
+# Date format of the version history of chocolatey packages
+CHOCOLATEY = '%A, %B %d, %Y'
+
+_memo = {}
+_learned = {}
+_stats = { 'parsed': 0, 'memoized': 0 }
+_lock = threading.Lock()
+
+def as_formats(formats):
+    return (formats,) if isinstance(formats, str) else tuple(formats)
+
+def probe(raw, formats, source):
+    """
+        ISO date of 'raw' with the first matching of 'formats', the last winner of 'source' first, or None
+    """
+    learned = _learned.get((source, formats), 0)
+    order = [ learned ] + [ index for index in range(len(formats)) if index != learned ]
+
+    for index in order:
+        try:
+            date = datetime.datetime.strptime(raw, formats[index]).date().isoformat()
+        except ValueError:
+            continue
+
+        _learned[(source, formats)] = index
+        return date
+
+    return None
+
+def parse(raw, formats, source=None):
+    """
+        ISO date of 'raw' in one of 'formats' (a format or a sequence of formats), None if none matches
+    """
+    formats = as_formats(formats)
+    key = (formats, raw)
+
+    try:
+        date = _memo[key]
+        with _lock:
+            _stats['memoized'] += 1
+        return date
+    except KeyError:
+        pass
+
+    date = probe(raw, formats, source)
+    with _lock:
+        _memo[key] = date
+        _stats['parsed'] += 1
+
+    return date
+
+def iso(raw, formats, source=None):
+    """
+        ISO date of 'raw' in one of 'formats', ValueError if none matches, as with 'strptime'
+    """
+    date = parse(raw, formats, source)
+    if date is None:
+        raise ValueError("date '%s' does not match %s" % (raw, list(as_formats(formats))))
+
+    return date
+
+def column(raws, formats, source=None):
+    """
+        ISO dates of a whole column of 'raws', each distinct value converted once, None where no format matches
+    """
+    formats = as_formats(formats)
+    converted = { raw: parse(raw, formats, source) for raw in dict.fromkeys(raws) }
+
+    return [ converted[raw] for raw in raws ]
+
+def report():
+    with _lock:
+        if not(_stats['parsed']):
+            return []
+
+        return [ '[+] dates: %d distinct dates parsed, %d reused' % (_stats['parsed'], _stats['memoized']) ]
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    Shared extraction helpers: precompiled XPath expressions and patterns, table cells
+
+    'element.xpath("string(td[4])")' compiles its expression on every call, i.e. for
+    every row of every page. Rows are walked once instead, their '<td>' children
+    picked by position, and the few XPath expressions left are compiled once here.
+    The 'is_*' and 'has_*' predicates select the rows of streamed pages, see
+    'tpvh.parsing.iterparse'.
+"""
+
+import re
+
+import lxml.etree
+
+# Compiled XPath expression, for the page level expressions of the scrapers
+XPath = lxml.etree.XPath
+
+# string-value of a node, i.e. the XPath 'string(.)'
+STRING = lxml.etree.XPath('string()')
+
+# Version at the start of most release names, e.g. '7-Zip 19.00' -> '19.00'
+P_VERSION = re.compile(r'(?P<version>\d{1,2}\..*)', re.IGNORECASE)
+
+# Characters not allowed in XML documents, which some pages contain
+P_CONTROL_CHARS = re.compile('[^\u0020-\uD7FF\u0009\u000A\u000D\uE000-\uFFFD\U00010000-\U0010FFFF]+')
+
+# C0 control characters other than tab and new lines, in raw bytes
+P_CONTROL_BYTES = re.compile(rb'[\x00-\x08\x0B\x0C\x0E-\x1F]')
+
+def remove_control_chars(content):
+    return P_CONTROL_CHARS.sub('', content)
+
+def sanitize(content):
+    """
+        Page 'content', its bytes or an iterable of its chunks, without C0 control characters
+
+        Such bytes never appear within a multibyte utf-8 sequence, they are dropped undecoded.
+    """
+    if isinstance(content, bytes):
+        return P_CONTROL_BYTES.sub(b'', content)
+
+    return ( P_CONTROL_BYTES.sub(b'', chunk) for chunk in content )
+
+def string(element):
+    """
+        string-value of 'element', '' for None, as 'string(element)'
+    """
+    return STRING(element) if element is not None else ''
+
+def first_text(element):
+    """
+        First text node directly under 'element', as 'string(element/text())'
+    """
+    if element is None:
+        return ''
+
+    if element.text is not None:
+        return element.text
+
+    for child in element:
+        if child.tail is not None:
+            return child.tail
+
+    return ''
+
+def texts(element):
+    """
+        Text nodes directly under 'element', as 'element/text()'
+    """
+    found = [ element.text ] if element.text is not None else []
+    return found + [ child.tail for child in element if child.tail is not None ]
+
+def child(element, *tags):
+    """
+        First child of 'element' with one of 'tags', None if there is none
+    """
+    if element is not None:
+        for candidate in element:
+            if candidate.tag in tags:
+                return candidate
+
+    return None
+
+def cells(row, count, tag='td'):
+    """
+        The first 'count' '<td>' (or 'tag') children of 'row', walked once, None for the missing ones
+    """
+    found = [ cell for cell in row if cell.tag == tag ][:count]
+    return found + [ None ] * (count - len(found))
+
+def is_row(element):
+    return element.tag == 'tr'
+
+def is_tbody_row(element):
+    """
+        Row of a table with an explicit '<tbody>' (Wikipedia), as './/tbody/tr'
+    """
+    parent = element.getparent()
+    return element.tag == 'tr' and parent is not None and parent.tag == 'tbody'
+
+def has_cell(row):
+    return child(row, 'td') is not None
+
+def has_chocolatey_cells(row):
+    """
+        Row with the 4 cells of a chocolatey version history, as 'tr[td[2]][td[4]]'
+    """
+    return cells(row, 4)[3] is not None
+
+def chocolatey_row(row):
+    """
+        (release, date) of a row of a chocolatey version history
+
+        Same as 'string(td[2]/a|td[2]/span)' and 'string(td[4])', the date being stripped.
+    """
+    first, name, third, date = cells(row, 4)
+    return string(child(name, 'a', 'span')), string(date).strip()
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    Asyncio fetch engine used by the 'from_*' sources to download all their pages at once
+
+    Sources stay plain generators: 'fetch_all' runs the downloads concurrently in the
+    background and hands every response over as soon as it is there, so the parsing of
+    the first page overlaps the download of the other ones.
+
+    Every request goes through one pooled session shared by all the scrapers of a run,
+    so connections to chocolatey, wikipedia or archive.apache.org are kept alive and
+    reused instead of paying a new TCP+TLS handshake per page. Requests also go through
+    the per-host limiters of 'tpvh.throttle', and are retried when a host answers with
+    a 429, a 503 or a Cloudflare challenge instead of the page.
+
+    Sources split in a 'parse_*' function turning the content of a page into
+    (version, item) rows go through 'scrape', which sends conditional GETs and reuses
+    the rows cached by 'tpvh.cache' when the page has not changed since the last run.
+
+    When a run is recorded or replayed by 'tpvh.store', 'get' stores every body it
+    fetches, or answers from the stored bodies without touching the network.
+
+    Large pages can be streamed: their body is handed to the parser chunk by chunk
+    while it downloads (see 'tpvh.parsing.iterparse'), instead of as a whole once complete.
+"""
+
+import asyncio
+import hashlib
+import functools
+import threading
+import concurrent.futures
+from urllib.parse import urlparse
+
+import requests
+import requests.adapters
+
+from tpvh import cache
+from tpvh import freeze
+from tpvh import incremental
+from tpvh import store
+from tpvh import throttle
+from tpvh import workers
+
+# Upper bound of the requests a single 'fetch_all' keeps in flight
+MAX_CONCURRENCY = 16
+
+# Connections kept open per host, and number of hosts whose pool is kept around
+POOL_MAXSIZE = 8
+POOL_HOSTS = 32
+
+# Seconds to wait for a server before giving up on a page
+TIMEOUT = 60
+
+# Bytes read at once from the body of a streamed page
+CHUNK_SIZE = 64 * 1024
+
+# Headers sent with every request, a browser User-Agent gets us past Cloudflare protection
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+# Answers meaning "slow down", retried after a backoff
+RETRY_STATUSES = (429, 503)
+RETRIES = 3
+BACKOFF = 5
+
+_session = None
+_session_lock = threading.Lock()
+
+def session():
+    """
+        Return the session shared by every source, created on first use
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            # pool_block makes POOL_MAXSIZE a hard cap on the connections opened to a host
+            adapter = requests.adapters.HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE, pool_block=True)
+            new_session = requests.Session()
+            new_session.headers.update(HEADERS)
+            new_session.mount('https://', adapter)
+            new_session.mount('http://', adapter)
+            _session = new_session
+
+        return _session
+
+def get(url, **kwargs):
+    """
+        Blocking GET through the shared session, the single place where the sources hit the network
+    """
+    if store.replaying():
+        return store.get(url)
+
+    kwargs.setdefault('timeout', TIMEOUT)
+    limiter = throttle.limiter(urlparse(url).hostname)
+
+    for attempt in range(RETRIES + 1):
+        if kwargs.get('stream'):
+            response = streamed_get(limiter, url, **kwargs)
+        else:
+            with limiter:
+                response = session().get(url, **kwargs)
+
+        if not(is_throttled(response)):
+            if response.status_code != 304:
+                store.put(url, response)
+            return response
+
+        # the retry waits for the bucket to refill, as every other request to the domain
+        delay = retry_after(response, BACKOFF * 2 ** attempt)
+        limiter.backoff(delay)
+        if attempt < RETRIES:
+            response.close()
+
+    # better fail loudly than parse a challenge page into zero rows
+    response.close()
+    response.raise_for_status()
+    raise requests.HTTPError('%s is still throttling us after %d retries' % (url, RETRIES), response=response)
+
+def streamed_get(limiter, url, **kwargs):
+    """
+        GET a streamed response, which keeps its in-flight slot of 'limiter' until it is closed
+
+        The headers of a streamed response are there long before its body, which must
+        count against the in-flight cap of the host as well.
+    """
+    limiter.acquire()
+    try:
+        response = session().get(url, **kwargs)
+    except BaseException:
+        limiter.release()
+        raise
+
+    close = response.close
+    released = threading.Lock()
+
+    def close_and_release():
+        try:
+            close()
+        finally:
+            if released.acquire(blocking=False):
+                limiter.release()
+
+    response.close = close_and_release
+
+    return response
+
+def is_throttled(response):
+    return response.status_code in RETRY_STATUSES or response.headers.get('cf-mitigated') == 'challenge'
+
+def retry_after(response, default):
+    """
+        Delay in seconds asked by the 'Retry-After' header, if it is given in seconds
+    """
+    value = response.headers.get('Retry-After', '')
+    try:
+        return max(0.0, min(float(value), TIMEOUT))
+    except ValueError:
+        return default
+
+async def fetch(url, getter=get, **kwargs):
+    """
+        GET a page without blocking the event loop
+    """
+    return await asyncio.to_thread(getter, url, **kwargs)
+
+async def fetch_many(urls, **kwargs):
+    """
+        GET every page concurrently, return the responses in the order of 'urls'
+    """
+    return await asyncio.gather(*[fetch(url, **kwargs) for url in urls])
+
+def fetch_all(urls, ordered=True, getter=get, **kwargs):
+    """
+        Yield (url, response) for every url, all the requests being in flight at the same time
+
+        With 'ordered' the responses are handed over in the order of 'urls', which keeps the
+        merge of the sources deterministic, otherwise in the order they arrive.
+        'getter' replaces 'get' to perform each request.
+    """
+    urls = list(urls)
+    tasks = []
+    loop = asyncio.new_event_loop()
+    loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(len(urls), MAX_CONCURRENCY))))
+    try:
+        tasks = [ loop.create_task(fetch(url, getter, **kwargs)) for url in urls ]
+
+        if ordered:
+            for url, task in zip(urls, tasks):
+                yield url, loop.run_until_complete(task)
+        else:
+            by_task = dict(zip(tasks, urls))
+            pending = set(tasks)
+            while pending:
+                done, pending = loop.run_until_complete(asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED))
+                for task in done:
+                    yield by_task[task], task.result()
+
+    finally:
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+
+def conditional_get(url, parse, partial=False, **kwargs):
+    """
+        GET 'url' with the validators of its cache entry, return (response, entry, rows)
+
+        'rows' are the rows 'parse' extracted last time when the page was not modified, or
+        came back with the same body, None otherwise. With 'partial', they can be the
+        rows of a page cut short, see 'tpvh.cache'.
+    """
+    # recorded and replayed runs need the bodies, not the cached rows
+    if store.recording() or store.replaying():
+        return get(url, **kwargs), None, None
+
+    entry = cache.load(url)
+    rows = cache.cached_rows(entry, parse, partial)
+    if rows is not None:
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.update(cache.validators(entry))
+        kwargs['headers'] = headers
+
+    response = get(url, **kwargs)
+    # the body of a streamed page is only known once it has been parsed
+    same_body = not(kwargs.get('stream')) and response.status_code == 200 and cache.same_body(entry, response.content)
+    unchanged = rows is not None and (response.status_code == 304 or same_body)
+    cache.count(unchanged)
+    if unchanged:
+        response.close()
+
+    return response, entry, rows if unchanged else None
+
+def conditional_get_and_submit(url, parse, partial=False, **kwargs):
+    """
+        'conditional_get', a modified page being handed over to a parse worker as soon as it is there
+
+        'rows' is then a future of the rows of the page.
+    """
+    response, entry, rows = conditional_get(url, parse, partial, **kwargs)
+    if rows is None:
+        rows = workers.submit(parse, response.content)
+
+    return response, entry, rows
+
+class StreamedBody(object):
+    """
+        Chunks of the body of a streamed response, hashed as they are read
+    """
+    def __init__(self, response):
+        self.response = response
+        self.sha256 = hashlib.sha256()
+        self.complete = False
+
+    def __iter__(self):
+        for chunk in self.response.iter_content(CHUNK_SIZE):
+            self.sha256.update(chunk)
+            yield chunk
+
+        self.complete = True
+
+    def digest(self):
+        """
+            sha256 of the body, None if it was not read to the end
+        """
+        return self.sha256.hexdigest() if self.complete else None
+
+def scrape(urls, parse, ordered=True, known=None, frozen=None, stream=False, **kwargs):
+    """
+        Yield the (version, item) rows 'parse' extracts from the content of every page of 'urls'
+
+        Pages are fetched concurrently and only parsed when they changed since the last run.
+        With 'known' (see 'tpvh.incremental'), pages listing versions newest first stop being
+        parsed after a run of known versions. The validators of such truncated pages are
+        cached with the rows read, as partial rows only reused with 'known', or with all
+        the rows of the page when a worker parsed it whole.
+        'frozen' (see 'tpvh.freeze') marks all the pages, or the listed ones, as never
+        changing: their persisted rows are reused without fetching them.
+        With 'stream', 'parse' gets the chunks of each body as they arrive, see 'StreamedBody';
+        such pages are fetched one after the other by the thread parsing them, so that no
+        connection is held by a body waiting for its turn, and a page truncated by 'known'
+        is not downloaded any further.
+        Pages are parsed by 'tpvh.workers' instead when it is enabled and can run 'parse',
+        and then downloaded whole.
+    """
+    urls = [urls] if isinstance(urls, str) else urls
+
+    # recorded and replayed runs need every page to go through the network layer
+    reused = {}
+    if not(store.recording() or store.replaying()):
+        for url in urls:
+            if freeze.is_frozen(url, frozen):
+                rows = freeze.load(url, parse)
+                if rows is not None:
+                    reused[url] = rows
+
+    # replayed bodies are already complete, and the pool needs whole bodies
+    pooled = workers.enabled() and workers.can_run(parse)
+    stream = stream and not(store.replaying() or pooled)
+    if stream:
+        fetched = ( (url, conditional_get(url, parse, bool(known), stream=True, **kwargs)) for url in urls if url not in reused )
+    else:
+        getter = conditional_get_and_submit if pooled else conditional_get
+        fetched = fetch_all([ url for url in urls if url not in reused ], ordered, functools.partial(getter, parse=parse, partial=bool(known)), **kwargs)
+    if not(ordered):
+        for url in urls:
+            yield from reused.get(url, [])
+
+    for url in urls:
+        if ordered and url in reused:
+            yield from reused[url]
+            continue
+
+        try:
+            fetched_url, (response, entry, rows) = next(fetched)
+        except StopIteration:
+            return
+
+        # rows reused with 'known' can be those of a page cut short
+        truncated = bool(known)
+        if rows is None or isinstance(rows, concurrent.futures.Future):
+            try:
+                if rows is None:
+                    content = StreamedBody(response) if stream else response.content
+                    parsed = parse(content)
+                else:
+                    parsed = rows.result()
+
+                if known:
+                    rows, truncated = incremental.take_until_known(parsed, known)
+                else:
+                    rows = list(parsed)
+            finally:
+                # a streamed response holds a slot of its host until it is closed
+                if stream:
+                    response.close()
+
+            # a worker hands over every row of the page, even when only some of them are used
+            complete, partial = (parsed, False) if isinstance(parsed, list) else (rows, truncated)
+
+            if stream:
+                digest = content.digest()
+                truncated = truncated or digest is None
+                partial = partial or digest is None
+            else:
+                digest = cache.body_hash(response.content)
+
+            if not(store.replaying()):
+                cache.store(fetched_url, response, parse, complete, entry, digest, partial)
+
+        if freeze.is_frozen(fetched_url, frozen) and not(truncated or store.replaying()):
+            freeze.store(fetched_url, parse, rows, response)
+
+        yield from rows
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    pandas backend of the output stage: sorting, previous file merge and csv writing
+
+    'tpvh.table' is the pandas-free equivalent, writing byte-identical files.
+"""
+
+import csv
+
+import numpy as np
+import pandas as pd
+
+from tpvh import table
+from tpvh import versionkey
+
+def keys(versions, scheme=versionkey.LOOSE):
+    """
+        Keys of 'versions' as an (n, WIDTH) int64 array
+    """
+    rows = versionkey.key_lists(versions, scheme)
+    versionkey.flush(scheme)
+
+    return np.array(rows, dtype=np.int64).reshape(len(rows), versionkey.WIDTH)
+
+def argsort(versions, scheme=versionkey.LOOSE):
+    """
+        Indices sorting 'versions' in ascending order, equal keys keeping their order
+    """
+    key_array = keys(versions, scheme)
+    return np.lexsort(key_array.T[::-1])
+
+def sort_frame(frame, scheme=versionkey.LOOSE, column='version_full'):
+    """
+        'frame' sorted on its 'column' versions, with a fresh index
+    """
+    return frame.iloc[argsort(frame[column].tolist(), scheme)].reset_index(drop=True)
+
+def insert_sorted(frame, rows, scheme=versionkey.LOOSE, column='version_full'):
+    """
+        'frame', sorted on its 'column' versions, with the 'rows' of the versions it lacks inserted in order
+
+        Same result as 'sort_frame' on both frames once the versions of 'frame' are dropped
+        from 'rows', without sorting the whole history again.
+    """
+    positions, indices = versionkey.insertions(frame[column].array, rows[column].tolist(), scheme)
+    if not(indices):
+        return frame.reset_index(drop=True)
+
+    merged = pd.concat([frame, rows.iloc[indices]], ignore_index=True)
+    order = np.insert(np.arange(len(frame)), positions, np.arange(len(frame), len(merged)))
+
+    return merged.iloc[order].reset_index(drop=True)
+
+def generate_csv(opts, results, scheme):
+    """
+        Write the { column: values } 'results', merged with the previous file in 'previous' mode
+    """
+    results = pd.DataFrame(results)
+
+    if opts.mode == 'previous':
+        old_results = pd.read_csv(opts.previous_file, delimiter=';', quoting=csv.QUOTE_ALL, lineterminator='\n')
+        final_results = insert_sorted(old_results, results, scheme)
+    else:
+        final_results = sort_frame(results, scheme)
+
+    return table.write_if_changed(opts, final_results.to_csv(sep=';', index=False, quoting=csv.QUOTE_ALL, lineterminator='\n'))
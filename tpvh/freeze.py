@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    Rows of frozen pages, which can no longer change
+
+    A source passes 'frozen=True' to 'tpvh.fetch.scrape' when all its pages are dead or
+    append-only history (the archived Flash Player page, the Drupal 1-6 history...), or
+    the list of its urls that are (e.g. the old VirtualBox changelogs). The rows of such
+    a page are persisted the first time it is parsed, and from then on reused without
+    fetching it, unless 'REFRESH' is set by '--refresh-frozen'. Only the rows of a page
+    that came back fine, and gave some, are persisted: an error or maintenance page is
+    fetched again by the next run instead.
+"""
+
+from os import path
+import os
+import json
+import hashlib
+import threading
+
+from tpvh import ROOT_DIR
+from tpvh import cache
+
+FROZEN_DIR = os.environ.get('TPVH_FROZEN_DIR', path.join(ROOT_DIR, '.cache', 'frozen'))
+
+# Fetch and parse frozen pages again, to check that they really did not change
+REFRESH = False
+
+_stats = { 'reused': 0 }
+_lock = threading.Lock()
+
+def is_frozen(url, frozen):
+    """
+        Whether 'url' is frozen, 'frozen' being True for a whole source or a collection of urls
+    """
+    if frozen is True:
+        return True
+
+    return bool(frozen) and url in frozen
+
+def entry_path(url):
+    return path.join(FROZEN_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+def load(url, parse):
+    """
+        Persisted rows of a frozen page, None if they have to be fetched
+    """
+    if REFRESH or not(FROZEN_DIR):
+        return None
+
+    try:
+        with open(entry_path(url), 'r', encoding='utf-8') as fd:
+            entry = json.load(fd)
+    except (OSError, ValueError):
+        return None
+
+    if entry.get('url') != url or entry.get('parser') != cache.parser_key(parse):
+        return None
+
+    with _lock:
+        _stats['reused'] += 1
+
+    return [ tuple(row) for row in entry['rows'] ]
+
+def store(url, parse, rows, response):
+    """
+        Persist the rows of a frozen page, return whether they were
+
+        'response' is the one the rows come from, a '304 Not Modified' one meaning that they
+        are the cached rows of a former '200 OK'.
+    """
+    if not(FROZEN_DIR):
+        return False
+
+    if response.status_code not in (200, 304) or not(rows):
+        print('[!] "%s" not frozen: status %d with %d rows' % (url, response.status_code, len(rows)))
+        return False
+
+    cache.write_json(entry_path(url), { 'url': url, 'parser': cache.parser_key(parse), 'rows': [ list(row) for row in rows ] })
+
+    return True
+
+def report():
+    with _lock:
+        return [ '[+] frozen pages: %d reused without fetching' % _stats['reused'] ] if _stats['reused'] else []
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    Early termination of newest-first histories in 'previous' mode
+
+    Chocolatey lists the versions of a package newest first, and in 'previous' mode
+    nearly all of them are already in the previous file. Once a page has yielded
+    'stop_after' known versions in a row, the rest of it is not parsed at all.
+"""
+
+import csv
+import collections
+
+# Consecutive known versions after which a newest-first page is not read any further
+STOP_AFTER = 20
+
+Known = collections.namedtuple('Known', ['versions', 'stop_after'])
+
+def read_versions(filename):
+    """
+        Set of the 'version_full' values of a generated csv file
+    """
+    with open(filename, 'r', encoding='utf-8', newline='') as fd:
+        reader = csv.reader(fd, delimiter=';', quoting=csv.QUOTE_ALL)
+        next(reader, None)
+        return set(row[0] for row in reader if row)
+
+def known_versions(opts):
+    """
+        Versions of the previous file to stop at, None when the whole history has to be read
+    """
+    stop_after = getattr(opts, 'stop_after', None)
+    if stop_after is None:
+        stop_after = STOP_AFTER
+
+    if opts.mode != 'previous' or stop_after <= 0:
+        return None
+
+    return Known(read_versions(opts.previous_file), stop_after)
+
+def take_until_known(rows, known):
+    """
+        Consume 'rows' until 'known.stop_after' known versions in a row, return (rows taken, truncated)
+    """
+    taken = []
+    run = 0
+    for row in rows:
+        taken.append(row)
+        run = run + 1 if row[0] in known.versions else 0
+        if run >= known.stop_after:
+            return taken, True
+
+    return taken, False
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+    Fleet inventory joined against the version histories, in bulk
+
+    Usage (from the repository root):
+        python3 -m tpvh.inventory -i inventory.csv -o report.csv [--today yyyy-mm-dd]
+
+    An inventory is a table of (host, product, version) rows, 'product' being a target
+    such as 'java' or 'tomcat'. 'join' adds to every row:
+        - release_date: date of the installed version, when it is in the history
+        - days_since_release: days from that date to 'today'
+        - releases_behind: versions of the history newer than the installed one
+        - latest_in_branch: newest version of the history sharing the first BRANCH_DEPTH
+          components of the installed one, e.g. '9.0.113' for tomcat '9.0.30', or the
+          number of components given by BRANCH_DEPTHS for the product and the version
+    Each distinct (product, version) pair is only resolved once, millions of hosts
+    running a few thousand versions between them. The versions of a history are
+    turned into numpy arrays of packed keys (see 'tpvh.versionkey.PACKED'), so that
+    the rank of a version and its branch are 'searchsorted' calls, and exact versions
+    are found with a hash index, before the results go back to the rows by their codes.
+"""
+
+import re
+import csv
+import sys
+import datetime
+import argparse
+import threading
+import collections
+
+import numpy as np
+import pandas as pd
+
+from tpvh import lookup
+from tpvh import versionkey
+
+P_MAJOR = re.compile(r'^\d+')
+
+def major(version):
+    found = P_MAJOR.match(version)
+    return int(found.group(0)) if found else 0
+
+# Leading version components making a branch, and the products whose branches differ: a number
+# of components, or a function of the version returning it, which must only depend on the major
+BRANCH_DEPTH = 2
+BRANCH_DEPTHS = {
+    '7-zip': 1,
+    'chrome': 1,
+    'edge': 1,
+    'firefox': 1,
+    'putty': 1,
+    'workstation': 1,
+    # Drupal 4.x were branches of their own, 5 to 7 only had a major and a minor, 8 and later are semantic
+    'drupal': lambda version: 2 if major(version) < 5 else 1,
+    # PostgreSQL 10 and later only have a major and a minor
+    'postgres': lambda version: 2 if major(version) < 10 else 1,
+}
+
+COLUMNS = ['host', 'product', 'version']
+
+# Arrays of a history: packed keys and branch prefixes in version order, dense rank of every key,
+# hash index of the versions, versions and release days
+Arrays = collections.namedtuple('Arrays', ['keys', 'branches', 'ranks', 'index', 'versions', 'days'])
+
+_arrays = {}
+_lock = threading.Lock()
+
+def branch_width(product, scheme, version):
+    """
+        Leading components of a key making the branch of 'version' of 'product'
+    """
+    depth = BRANCH_DEPTHS.get(product, BRANCH_DEPTH)
+    if callable(depth):
+        depth = depth(version)
+
+    # pep440 keys start with the epoch
+    return depth + 1 if scheme == versionkey.PEP440 else depth
+
+def branches(product, scheme, versions, keys):
+    """
+        Keys of 'versions' cut to their branch and packed as a numpy bytes array, comparing like the keys
+
+        The components after the branch are zeroed, so that prefixes of different widths
+        still sort in the order of the keys.
+    """
+    prefixes = []
+    for version, key in zip(versions, keys):
+        width = branch_width(product, scheme, version)
+        prefixes.append(versionkey.PACKED.pack(*(list(key[:width]) + [ 0 ] * (versionkey.WIDTH - width))))
+
+    return np.array(prefixes, dtype='S%d' % versionkey.PACKED.size)
+
+def packed(keys):
+    """
+        'keys' packed as a numpy bytes array, comparing like the keys
+    """
+    return np.array([ versionkey.PACKED.pack(*key) for key in keys ], dtype='S%d' % versionkey.PACKED.size)
+
+def arrays(product):
+    """
+        Arrays of the history of 'product', built again when 'tpvh.lookup' reloads it
+    """
+    found = lookup.history(product)
+    with _lock:
+        cached = _arrays.get(product)
+        if cached is not None and cached[0] is found:
+            return cached[1]
+
+    keys = packed(found.keys)
+    prefixes = branches(product, found.scheme, found.versions, found.keys)
+
+    # equal keys share their rank
+    ranks = np.concatenate([[0], np.cumsum(keys[1:] != keys[:-1])]).astype(np.int64) if len(keys) else np.zeros(0, dtype=np.int64)
+
+    index = pd.Index(found.versions)
+    first = ~index.duplicated(keep='first')
+    index = pd.Series(np.flatnonzero(first), index=index[first])
+
+    days = np.array([ date if date and lookup.P_ISO_DATE.match(date) else 'NaT' for date in found.dates ], dtype='datetime64[D]')
+
+    result = Arrays(keys, prefixes, ranks, index, np.array(found.versions, dtype=object), days)
+    with _lock:
+        _arrays[product] = (found, result)
+
+    return result
+
+def version_keys(versions, scheme):
+    """
+        Keys of the installed 'versions', None for those that the scheme cannot read
+    """
+    key_function = versionkey.KEY_FUNCTIONS[scheme]
+
+    # computed apart from the memo of 'tpvh.versionkey', not to save the keys of inventories with those of the histories
+    keys = []
+    for version in versions:
+        try:
+            keys.append(key_function(version))
+        except ValueError:
+            keys.append(None)
+
+    return keys
+
+def resolve(product, versions):
+    """
+        (release days, releases behind, latest in branch) of the installed 'versions' of 'product'
+    """
+    count = len(versions)
+    days = np.full(count, np.datetime64('NaT'), dtype='datetime64[D]')
+    behind = np.full(count, -1, dtype=np.int64)
+    latest = np.full(count, None, dtype=object)
+
+    try:
+        found = arrays(product)
+    except KeyError:
+        return days, behind, latest
+
+    positions = found.index.reindex(versions).to_numpy()
+    exact = ~np.isnan(positions)
+    days[exact] = found.days[positions[exact].astype(np.int64)]
+
+    scheme = lookup.history(product).scheme
+    keys = version_keys(versions, scheme)
+    readable = np.array([ key is not None for key in keys ], dtype=bool)
+    if not(readable.any()) or not(len(found.keys)):
+        return days, behind, latest
+
+    versions = [ version for version, key in zip(versions, keys) if key is not None ]
+    keys = [ key for key in keys if key is not None ]
+
+    # rows at or below a version, then the distinct versions above it
+    below = np.searchsorted(found.keys, packed(keys), side='right')
+    ranks = np.where(below > 0, found.ranks[np.maximum(below - 1, 0)] + 1, 0)
+    behind[readable] = found.ranks[-1] + 1 - ranks
+
+    # the branch of a version is a run of rows sharing its prefix, the last one is the newest
+    prefixes = branches(product, scheme, versions, keys)
+    start = np.searchsorted(found.branches, prefixes, side='left')
+    end = np.searchsorted(found.branches, prefixes, side='right')
+    in_branch = end > start
+    newest = np.full(len(keys), None, dtype=object)
+    newest[in_branch] = found.versions[end[in_branch] - 1]
+    latest[readable] = newest
+
+    return days, behind, latest
+
+def join(inventory, today=None):
+    """
+        'inventory', a DataFrame with COLUMNS, with its release_date, days_since_release,
+        releases_behind and latest_in_branch columns added
+
+        Missing values are NaT or <NA>: versions that are not in the history, or that do not
+        parse, and products without a history. 'today' defaults to the current date.
+    """
+    today = np.datetime64(today or datetime.date.today(), 'D')
+
+    # the pairs are factorized as integers, hashing the strings of each column once
+    product_codes, products = pd.factorize(inventory['product'].astype(str))
+    version_codes, versions = pd.factorize(inventory['version'].astype(str))
+    codes, pairs = pd.factorize(product_codes.astype(np.int64) * len(versions) + version_codes)
+
+    count = len(pairs)
+    days = np.full(count, np.datetime64('NaT'), dtype='datetime64[D]')
+    behind = np.full(count, -1, dtype=np.int64)
+    latest = np.full(count, None, dtype=object)
+
+    pair_products = pairs // max(len(versions), 1)
+    pair_versions = pairs % max(len(versions), 1)
+    for code, product in enumerate(products):
+        selected = np.flatnonzero(pair_products == code)
+        days[selected], behind[selected], latest[selected] = resolve(product, versions[pair_versions[selected]].tolist())
+
+    release_days = days[codes]
+    undated = np.isnat(release_days)
+    behind = behind[codes]
+
+    result = inventory.copy()
+    result['release_date'] = release_days
+    result['days_since_release'] = pd.arrays.IntegerArray((today - release_days).astype(np.int64), undated)
+    result['releases_behind'] = pd.arrays.IntegerArray(behind, behind < 0)
+    result['latest_in_branch'] = latest[codes]
+
+    return result
+
+# Options definition
+parser = argparse.ArgumentParser(description='Join an inventory of installed versions against the version histories')
+parser.add_argument('-i', '--input-file', help="Inventory csv file, ';' separated, with the '%s' columns" % "', '".join(COLUMNS), required = True)
+parser.add_argument('-o', '--output-file', help='Output csv file (default: stdout)', default = None)
+parser.add_argument('--today', help='Date to count the days since release to, as yyyy-mm-dd (default: today)', type = datetime.date.fromisoformat, default = None)
+
+def main():
+    """
+        Dat main
+    """
+    global parser
+    options = parser.parse_args()
+
+    inventory = pd.read_csv(options.input_file, delimiter=';', quoting=csv.QUOTE_ALL, dtype=str, keep_default_na=False)
+    missing = [ column for column in COLUMNS if column not in inventory.columns ]
+    if missing:
+        parser.error('[!] columns %s missing from "%s"' % (missing, options.input_file))
+
+    result = join(inventory, options.today)
+    result.to_csv(options.output_file or sys.stdout, sep=';', index=False, quoting=csv.QUOTE_ALL, lineterminator='\n', date_format='%Y-%m-%d')
+
+    return 0
+
+if __name__ == "__main__" :
+    sys.exit(main())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+    Release dates of product versions, straight from the generated csv files
+
+        >>> from tpvh import lookup
+        >>> lookup.lookup('tomcat', '9.0.30')
+        '2019-12-12'
+        >>> lookup.lookup_many([ ('java', '1.8.0_281'), ('firefox', '85.0') ])
+        ['2021-01-19', '2021-01-26']
+
+    A product file is only read the first time the product is queried, then kept
+    warm: a hash index of its versions answers 'lookup', and the array of its
+    version keys, sorted, answers 'floor' for versions that are not in the history
+    (e.g. the newest release at or below an installed build). 'clear' forgets them,
+    to read the files again.
+
+    'as_of' gives the newest version of a product released on or before a date. The
+    dated rows are kept in date order with the running maximum of their version,
+    so that a query is a single bisection, even for histories whose dates do not
+    follow the versions (Exchange cumulative updates and security updates, backports).
+    'as_of_many' answers whole arrays of (product, date) with numpy.
+"""
+
+from os import path
+import re
+import glob
+import bisect
+import threading
+import collections
+
+from tpvh import ROOT_DIR
+from tpvh import merge
+from tpvh import table
+from tpvh import versionkey
+
+# Where to look for the '<product>/<target>.csv' files
+DATA_DIR = ROOT_DIR
+
+History = collections.namedtuple('History', ['product', 'scheme', 'columns', 'versions', 'dates', 'keys', 'index'])
+
+# Only full dates make it to the timelines, not approximate ones such as 'March 2008' or '?'
+P_ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Dates of the dated rows in ascending order, and the position in the history of the newest version released so far
+Timeline = collections.namedtuple('Timeline', ['dates', 'newest'])
+
+_files = None
+_histories = {}
+_timelines = {}
+_arrays = {}
+_lock = threading.Lock()
+
+def files():
+    """
+        Return { product: csv file } for the generated files of 'DATA_DIR'
+    """
+    global _files
+    with _lock:
+        if _files is None:
+            _files = { path.splitext(path.basename(filename))[0]: filename for filename in glob.glob(path.join(glob.escape(DATA_DIR), '*', '*.csv')) }
+
+        return _files
+
+def products():
+    return sorted(files())
+
+def load(product):
+    """
+        History of 'product', its rows sorted on their version key
+    """
+    filename = files().get(product)
+    if filename is None:
+        raise KeyError('[!] no history for "%s" in "%s"' % (product, DATA_DIR))
+
+    return read(product, filename)
+
+def read(product, filename):
+    """
+        History of 'product' in the csv file 'filename'
+    """
+    header, rows = table.read_csv(filename)
+    scheme = versionkey.scheme_of(product)
+
+    # the files are written in version order, sorting them again only costs a pass over them
+    order = versionkey.sort_order([ row[0] for row in rows ], scheme)
+    rows = [ rows[position] for position in order ]
+
+    columns = { column: [ row[position] for row in rows ] for position, column in enumerate(header) }
+    versions = columns[merge.VERSION_COLUMN]
+    dates = [ date or None for date in columns.get(merge.DATE_COLUMN, [ '' ] * len(rows)) ]
+    keys = versionkey.key_lists(versions, scheme)
+
+    # the first row of a version wins, as in 'merge.scrape_and_merge'
+    index = {}
+    for position, version in enumerate(versions):
+        index.setdefault(version, position)
+
+    return History(product, scheme, columns, versions, dates, keys, index)
+
+def history(product):
+    """
+        History of 'product', loaded on first use
+    """
+    found = _histories.get(product)
+    if found is None:
+        found = load(product)
+        with _lock:
+            found = _histories.setdefault(product, found)
+
+    return found
+
+def clear():
+    """
+        Forget the histories loaded so far, and the files found
+    """
+    global _files
+    with _lock:
+        _histories.clear()
+        _timelines.clear()
+        _arrays.clear()
+        _files = None
+
+def lookup(product, version):
+    """
+        Release date of 'version' of 'product', None if it is not in its history or has no date
+    """
+    found = history(product)
+    position = found.index.get(version)
+
+    return found.dates[position] if position is not None else None
+
+def lookup_many(pairs):
+    """
+        Release dates of the (product, version) 'pairs', in their order, see 'lookup'
+    """
+    dates = []
+    for product, version in pairs:
+        found = history(product)
+        position = found.index.get(version)
+        dates.append(found.dates[position] if position is not None else None)
+
+    return dates
+
+def floor(product, version):
+    """
+        (version, date) of the newest release of 'product' at or below 'version', None if there is none
+
+        'version' not being read by the scheme of the product (e.g. pep440) means none.
+    """
+    found = history(product)
+    position = found.index.get(version)
+    if position is None:
+        # queries are kept out of the memo of 'tpvh.versionkey', which is saved with the keys of the histories
+        try:
+            key = versionkey.KEY_FUNCTIONS[found.scheme](version)
+        except ValueError:
+            return None
+
+        position = bisect.bisect_right(found.keys, key) - 1
+        if position < 0:
+            return None
+
+    return found.versions[position], found.dates[position]
+
+def timeline(product):
+    """
+        Timeline of 'product', built on first use
+    """
+    found = _timelines.get(product)
+    if found is None:
+        dates = history(product).dates
+
+        # rows are sorted on their version, the newest version so far is the highest position so far
+        dated = sorted((date, position) for position, date in enumerate(dates) if date and P_ISO_DATE.match(date))
+        newest = []
+        for date, position in dated:
+            newest.append(max(position, newest[-1]) if newest else position)
+
+        found = Timeline([ date for date, position in dated ], newest)
+        with _lock:
+            found = _timelines.setdefault(product, found)
+
+    return found
+
+def as_of(product, date):
+    """
+        (version, date) of the newest version of 'product' released on or before 'date', None if there is none
+
+        'date' is a 'yyyy-mm-dd' string or a 'datetime.date'.
+    """
+    found = timeline(product)
+    position = bisect.bisect_right(found.dates, str(date)) - 1
+    if position < 0:
+        return None
+
+    newest = found.newest[position]
+    return history(product).versions[newest], history(product).dates[newest]
+
+def arrays(product):
+    """
+        numpy (days, newest versions) of the timeline of 'product'
+    """
+    import numpy as np
+
+    found = _arrays.get(product)
+    if found is None:
+        line = timeline(product)
+        versions = history(product).versions
+        found = (np.array(line.dates, dtype='datetime64[D]'), np.array([ versions[position] for position in line.newest ], dtype=object))
+        with _lock:
+            found = _arrays.setdefault(product, found)
+
+    return found
+
+def as_of_many(products, dates):
+    """
+        Newest versions of the 'products' released on or before the 'dates', as a numpy object array
+
+        'products' and 'dates' are arrays of the same length, the dates being 'yyyy-mm-dd'
+        strings, 'datetime.date' or 'datetime64'; versions are None where there is none.
+    """
+    import numpy as np
+
+    names, codes = np.unique(np.asarray(products, dtype=str), return_inverse=True)
+    days = np.asarray(dates, dtype='datetime64[D]')
+    versions = np.full(len(codes), None, dtype=object)
+
+    # one sort groups the rows of every product
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+
+    for code, product in enumerate(names.tolist()):
+        selected = order[bounds[code]:bounds[code + 1]]
+        line_days, line_versions = arrays(product)
+
+        positions = np.searchsorted(line_days, days[selected], side='right') - 1
+        released = positions >= 0
+        versions[selected[released]] = line_versions[positions[released]]
+
+    return versions
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    Merge of the rows of every source of a scraper, first source wins
+
+    A version already collected is skipped through a set lookup, and rows are kept as
+    one list per column, so that the DataFrame is built once, from the full columns.
+"""
+
+import concurrent.futures
+
+VERSION_COLUMN = 'version_full'
+DATE_COLUMN = 'date (yyyy-mm-dd)'
+
+def item_key(column):
+    """
+        Key of the item dict yielded by the sources holding the value of 'column'
+    """
+    return 'date' if column == DATE_COLUMN else column
+
+def scrape_and_merge(sources, columns, accept=None):
+    """
+        Collect the (version, item) rows of the (name, source) 'sources' into { column: values }
+
+        A source is an iterable of rows or a future returning one. Versions for which
+        'accept' returns False are dropped.
+    """
+    results = { column: [] for column in columns }
+    versions = results[VERSION_COLUMN]
+    others = [ (results[column], item_key(column)) for column in columns if column != VERSION_COLUMN ]
+    seen = set()
+
+    for name, source in sources:
+        if isinstance(source, concurrent.futures.Future):
+            source = source.result()
+
+        count = 0
+        for version, item in source:
+            if version in seen or (accept and not(accept(version))):
+                continue
+
+            seen.add(version)
+            versions.append(version)
+            for values, key in others:
+                values.append(item[key])
+            count = count + 1
+
+        print("[+] %s entries collected from '%s'" % (count, name))
+
+    return results
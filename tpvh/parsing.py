@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    HTML parsing with the native libxml2 parser first, BeautifulSoup only as a fallback
+
+    'lxml.html.soupparser' goes through BeautifulSoup and is several times slower than
+    the libxml2 HTML parser. Pages are parsed natively, then checked against the
+    structure their source expects (an xpath that must match, e.g. the 'td[2]'/'td[4]'
+    rows of chocolatey), and only parsed again with soupparser when the check fails.
+    The backend used for every source is recorded for the run report.
+
+    Large pages read as a stream go through 'iterparse' instead, which feeds the chunks
+    to an incremental parser as they arrive and hands over the wanted elements as soon
+    as they are complete, dropping the rest of the document along the way.
+"""
+
+import itertools
+import threading
+import collections
+
+import lxml.etree
+import lxml.html
+
+LXML = 'lxml'
+SOUPPARSER = 'soupparser'
+
+_backends = collections.defaultdict(collections.Counter)
+_lock = threading.Lock()
+_parsers = threading.local()
+
+def native_parser(encoding):
+    """
+        libxml2 HTML parsers are not thread safe, every thread gets its own
+    """
+    parsers = getattr(_parsers, 'parsers', None)
+    if parsers is None:
+        parsers = _parsers.parsers = {}
+
+    if encoding not in parsers:
+        parsers[encoding] = lxml.html.HTMLParser(encoding=encoding, recover=True)
+
+    return parsers[encoding]
+
+def encoding_of(content):
+    """
+        'utf-8' for utf-8 bodies, decoded as such even without a charset declaration, None otherwise
+    """
+    if isinstance(content, bytes):
+        try:
+            content.decode('utf-8')
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+
+    return None
+
+def native_fromstring(content):
+    """
+        Parse with libxml2
+    """
+    return lxml.html.document_fromstring(content, parser=native_parser(encoding_of(content)))
+
+def soup_fromstring(content):
+    # imported on first use only, BeautifulSoup is slow to import and rarely needed
+    from lxml.html.soupparser import fromstring
+    return fromstring(content)
+
+def has(root, expect):
+    """
+        Whether the xpath 'expect', a string or a compiled 'lxml.etree.XPath', matches in 'root'
+    """
+    return bool(expect(root) if callable(expect) else root.xpath(expect))
+
+def count(source, backend, pages=1):
+    with _lock:
+        _backends[source or '-'][backend] += pages
+
+def fromstring(content, expect=None, source=None):
+    """
+        Parse an HTML page, natively if the result has the 'expect' xpath, with soupparser otherwise
+    """
+    root = None
+    backend = LXML
+    try:
+        root = native_fromstring(content)
+    except (lxml.etree.ParserError, ValueError):
+        root = None
+
+    if root is None or (expect is not None and not(has(root, expect))):
+        root = soup_fromstring(content)
+        backend = SOUPPARSER
+
+    count(source, backend)
+
+    return root
+
+def release(element):
+    """
+        Drop the content of a complete element and its previous siblings, which are not needed anymore
+    """
+    element.clear(keep_tail=True)
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+def iterparse(content, match, expect=None, source=None):
+    """
+        Yield the elements of an HTML page for which 'match' is true, each one as soon as it is complete
+
+        'content' is the body of the page, or an iterable of its chunks, then read as utf-8.
+        'match' only sees the tag, the attributes and the ancestors of an element, the elements
+        of a match are kept until the consumer is done with it, everything else is cleared
+        as soon as it is complete so that memory does not grow with the page. The page is
+        parsed again with soupparser when no element matched, or none passed 'expect'; the
+        chunks are only kept until then.
+    """
+    if isinstance(content, bytes):
+        chunks = [ content ]
+        encoding = encoding_of(content)
+    else:
+        chunks = content
+        encoding = 'utf-8'
+
+    pull = lxml.etree.HTMLPullParser(events=('start', 'end'), encoding=encoding, recover=True)
+    buffered = []
+    pending = []
+    current = None
+    found = False
+
+    def events(chunk):
+        if chunk is None:
+            pull.close()
+        else:
+            pull.feed(chunk)
+        return pull.read_events()
+
+    for chunk in itertools.chain(chunks, [ None ]):
+        if not(found) and chunk is not None:
+            buffered.append(chunk)
+
+        for event, element in events(chunk):
+            if event == 'start':
+                if current is None and match(element):
+                    current = element
+                continue
+
+            if current is not None and element is not current:
+                continue
+
+            if element is current:
+                current = None
+                if not(found) and (expect is None or expect(element)):
+                    found = True
+                    buffered = None
+                    for held in pending:
+                        yield held
+                    pending = None
+
+                if not(found):
+                    pending.append(element)
+                    continue
+
+                yield element
+
+            release(element)
+
+    if found:
+        count(source, LXML)
+        return
+
+    root = soup_fromstring(b''.join(buffered))
+    count(source, SOUPPARSER)
+    for element in root.iter():
+        if match(element):
+            yield element
+
+def reset():
+    with _lock:
+        _backends.clear()
+
+def backends():
+    """
+        Return { source: { backend: pages } } for the run so far
+    """
+    with _lock:
+        return { source: dict(counter) for source, counter in _backends.items() }
+
+def report():
+    lines = []
+    for source, counter in sorted(backends().items()):
+        if counter.get(SOUPPARSER):
+            lines.append('[!] %s: soupparser fallback for %d of %d pages' % (source, counter[SOUPPARSER], sum(counter.values())))
+
+    total = collections.Counter()
+    for counter in backends().values():
+        total.update(counter)
+    if total:
+        lines.insert(0, '[+] html parsing: %d pages with lxml, %d with soupparser' % (total[LXML], total[SOUPPARSER]))
+
+    return lines
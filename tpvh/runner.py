@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    Run every '*-scraper.py' script in a single process, through a pool of workers
+
+    Usage (from the repository root):
+        python3 -m tpvh.runner [-m previous|standalone] [-j N] [target ...]
+
+    '--record' keeps every page fetched in the local store, '--replay <run-id>' runs the
+    scrapers again against the pages of that run, without any network access.
+    '--processes N' parses the pages in N processes, see 'tpvh.workers'.
+    '--snapshot FILE' writes all the histories to a binary snapshot once the scrapers are done, see 'tpvh.snapshot'.
+"""
+
+from os import path
+import io
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+import threading
+import traceback
+import importlib.util
+import concurrent.futures
+
+from tpvh import ROOT_DIR
+from tpvh import cache
+from tpvh import database
+from tpvh import dates
+from tpvh import freeze
+from tpvh import incremental
+from tpvh import parsing
+from tpvh import snapshot
+from tpvh import store
+from tpvh import table
+from tpvh import throttle
+from tpvh import workers
+
+# Globals
+VERSION = '1.0'
+
+# Options definition
+parser = argparse.ArgumentParser(description="version: " + VERSION)
+parser.add_argument('-m', '--mode', help="Mode to choose: check against a previous provided file ('previous'), or 'standalone' scrape (default 'previous')", choices = ['previous', 'standalone'], type = str.lower, default = 'previous')
+parser.add_argument('-j', '--jobs', help='Number of scrapers to run at the same time (default: all of them)', type = int, default = None)
+parser.add_argument('-r', '--root', help='Repository root to look for scrapers in (default %s)' % ROOT_DIR, default = ROOT_DIR)
+parser.add_argument('--host-limit', help="Limits of a domain as 'domain=rate[,inflight[,burst]]', e.g. 'chocolatey.org=2,4' (can be repeated)", action = 'append', default = [])
+parser.add_argument('-s', '--stop-after', help="In 'previous' mode, stop reading newest-first histories after this number of consecutive known versions, 0 to read them all (default %d)" % incremental.STOP_AFTER, type = int, default = None)
+parser.add_argument('--database', help='Also keep this SQLite database of all the histories in sync with the csv files (default: none)', default = None, metavar = 'FILE')
+parser.add_argument('--snapshot', help='Write all the histories to this binary snapshot at the end of the run (default: none)', default = None, metavar = 'FILE')
+parser.add_argument('-P', '--processes', help='Parse the pages in this number of processes, 0 to parse them on the threads of the scrapers (default %d)' % workers.PROCESSES, type = int, default = None)
+parser.add_argument('-l', '--lean', help='Merge, sort and write the csv files without pandas, to the same bytes', action = 'store_true', default = False)
+parser.add_argument('--refresh-frozen', help='Fetch again the pages marked as frozen instead of reusing their persisted rows', action = 'store_true', default = False)
+parser.add_argument('--record', help='Store every page fetched, under this run id (default: a timestamp)', nargs = '?', const = '', default = None, metavar = 'RUN_ID')
+parser.add_argument('--replay', help="Replay a recorded run from the local store instead of using the network, 'latest' for the last one", default = None, metavar = 'RUN_ID')
+parser.add_argument('targets', help="Only run these targets, e.g. 'java' 'tomcat' (default: all)", nargs = '*', type = str.lower)
+
+class ThreadLocalOutput(io.TextIOBase):
+    """
+        Stand-in for sys.stdout that keeps the output of every worker thread apart,
+        so that the logs of concurrent scrapers are printed as one block each
+    """
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def capture(self):
+        self.local.buffer = io.StringIO()
+
+    def release(self):
+        buffer = getattr(self.local, 'buffer', None)
+        self.local.buffer = None
+        return buffer.getvalue() if buffer else ''
+
+    def write(self, content):
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is not None:
+            return buffer.write(content)
+        return self.stream.write(content)
+
+    def flush(self):
+        self.stream.flush()
+
+def find_scrapers(root):
+    """
+        Return the path of every '<product>/_source/*-scraper.py' script
+    """
+    return sorted(glob.glob(path.join(glob.escape(root), '*', '_source', '*-scraper.py')))
+
+def load_scraper(script):
+    """
+        Import a scraper script as a module, its __main__ guard keeps it from running
+    """
+    name = 'tpvh_scraper_%s' % re.sub(r'\W', '_', path.basename(script)[:-len('.py')])
+    spec = importlib.util.spec_from_file_location(name, script)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+    return module
+
+def scraper_options(module, script, mode):
+    """
+        Build the options the scraper would get when launched from its '_source' directory
+    """
+    source_dir = path.dirname(script)
+    previous_file = path.join(source_dir, '..', '%s.csv' % module.TARGET)
+    output_file = path.join(source_dir, '%s.csv' % module.TARGET)
+
+    options = module.parser.parse_args(['-m', mode, '-p', path.abspath(previous_file), '-o', path.abspath(output_file)])
+    if options.mode == 'previous' and not(os.path.isfile(options.previous_file)):
+        raise FileNotFoundError('[!] previous file "%s" cannot be found' % options.previous_file)
+
+    return options
+
+def run_scraper(output, module, script, mode):
+    output.capture()
+    start = time.perf_counter()
+    try:
+        options = scraper_options(module, script, mode)
+        if options.mode == 'previous':
+            print('[+] using previous mode with "%s" file' % options.previous_file)
+
+        module.scrape_and_generate_csv(options)
+        succeeded = True
+
+    except Exception:
+        traceback.print_exc(file=sys.stdout)
+        succeeded = False
+
+    elapsed = time.perf_counter() - start
+    return succeeded, elapsed, output.release()
+
+def run(opts):
+    scripts = find_scrapers(opts.root)
+
+    # importing every scraper here loads lxml and requests once for the whole run
+    modules = []
+    for script in scripts:
+        module = load_scraper(script)
+        if not(opts.targets) or module.TARGET in opts.targets:
+            modules.append((script, module))
+
+    unknown = set(opts.targets) - set(module.TARGET for script, module in modules)
+    if unknown:
+        parser.error('[!] unknown target(s): %s' % ', '.join(sorted(unknown)))
+
+    if not(modules):
+        parser.error('[!] no scraper found in "%s"' % opts.root)
+
+    jobs = opts.jobs or len(modules)
+    output = ThreadLocalOutput(sys.stdout)
+    failures = []
+
+    start = time.perf_counter()
+    sys.stdout = output
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+            futs = { executor.submit(run_scraper, output, module, script, opts.mode): script
+                     for script, module in modules }
+
+            for fut in concurrent.futures.as_completed(futs):
+                script = futs[fut]
+                succeeded, elapsed, log = fut.result()
+                if not(succeeded):
+                    failures.append(path.basename(script))
+
+                print(path.basename(script))
+                print(log, end='')
+                print('[%s] done in %.2fs' % ('+' if succeeded else '!', elapsed))
+                print('----------------')
+    finally:
+        sys.stdout = output.stream
+        workers.shutdown()
+
+    if snapshot.enabled():
+        snapshot.write(snapshot.SNAPSHOT, opts.root)
+
+    print('[+] %d scrapers run in %.2fs with %d jobs' % (len(modules), time.perf_counter() - start, jobs))
+    for line in throttle.report() + cache.report() + freeze.report() + parsing.report() + dates.report() + workers.report() + table.report() + database.report() + snapshot.report():
+        print(line)
+    if store.recording():
+        print('[+] run recorded in "%s"' % store.save())
+    if failures:
+        print('[!] %d scraper(s) failed: %s' % (len(failures), ', '.join(failures)))
+
+    return failures
+
+def main():
+    """
+        Dat main
+    """
+    global parser
+    options = parser.parse_args()
+
+    if options.jobs is not None and options.jobs < 1:
+        parser.error('[!] the number of jobs must be at least 1')
+
+    options.root = path.abspath(options.root)
+
+    freeze.REFRESH = options.refresh_frozen
+    table.LEAN = table.LEAN or options.lean
+
+    if options.database is not None:
+        database.DATABASE = path.abspath(options.database)
+
+    if options.snapshot is not None:
+        snapshot.SNAPSHOT = path.abspath(options.snapshot)
+
+    if options.processes is not None:
+        if options.processes < 0:
+            parser.error('[!] the number of processes cannot be negative')
+        workers.PROCESSES = options.processes
+
+    if options.stop_after is not None:
+        incremental.STOP_AFTER = options.stop_after
+
+    for spec in options.host_limit:
+        try:
+            throttle.parse_limit(spec)
+        except ValueError as e:
+            parser.error('[!] %s' % e)
+
+    if options.record is not None and options.replay:
+        parser.error('[!] --record and --replay cannot be used together')
+
+    if options.record is not None:
+        store.record(options.record or None)
+
+    if options.replay:
+        run_id = options.replay
+        if run_id == 'latest':
+            if not(store.runs()):
+                parser.error('[!] there is no recorded run to replay')
+            run_id = store.runs()[-1]
+        try:
+            print('[+] replaying %d pages of run "%s"' % (store.replay(run_id), run_id))
+        except FileNotFoundError as e:
+            parser.error(str(e))
+
+    failures = run(options)
+
+    return 1 if failures else 0
+
+if __name__ == "__main__" :
+    sys.exit(main())
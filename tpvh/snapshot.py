@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+    Binary snapshot of all the histories, read through mmap
+
+        >>> from tpvh import snapshot
+        >>> histories = snapshot.load('histories.snapshot')
+        >>> snapshot.lookup(histories, 'tomcat', '9.0.30')
+        '2019-12-12'
+
+    With 'SNAPSHOT' set ('--snapshot' or 'TPVH_SNAPSHOT'), the runner writes every
+    history to a single file at the end of a run, laid out as arrays that a reader maps
+    in memory as is, without parsing anything nor creating an object per row:
+        - a header (HEADER), then one PRODUCT record per product: its name, its scheme
+          and the range of its rows, sorted on their version
+        - the key of every row, packed as 'tpvh.versionkey.PACKED', bisected as bytes
+        - the release date of every row as an int32 number of days since 1970-01-01,
+          NO_DATE for no or an approximate date ('March 2008', '?')
+        - the index of the version string of every row, the strings being interned:
+          uint32 offsets, then their utf-8 bytes
+    The integers are in the byte order of the host that wrote the file. The pages of the
+    file are shared by every process mapping it, and 'load' only reads the header and the
+    product records. The reader only needs the standard library.
+"""
+
+from os import path
+import os
+import sys
+import glob
+import mmap
+import array
+import bisect
+import struct
+import datetime
+import functools
+import threading
+import collections
+
+from tpvh import cache
+from tpvh import versionkey
+
+# Snapshot written at the end of a run, '' for none
+SNAPSHOT = os.environ.get('TPVH_SNAPSHOT', '')
+
+MAGIC = b'TPVHSNAP'
+
+# Bump when the layout changes
+FORMAT = 1
+
+# magic, byte order, format, key width, products, rows, strings, then the offsets of
+# the product records, keys, days, version indices, string offsets and string bytes
+HEADER = struct.Struct('=8s8sIIIIII6Q')
+NAME_SIZE = 32
+PRODUCT = struct.Struct('=%ds8sII' % NAME_SIZE)
+
+NO_DATE = -2**31
+EPOCH = datetime.date(1970, 1, 1)
+
+# Sections start on a multiple of ALIGNMENT
+ALIGNMENT = 8
+
+Product = collections.namedtuple('Product', ['scheme', 'start', 'rows'])
+Snapshot = collections.namedtuple('Snapshot', ['filename', 'products', 'buffer', 'keys', 'days', 'versions', 'offsets', 'strings'])
+
+_stats = {}
+_lock = threading.Lock()
+
+def enabled():
+    return bool(SNAPSHOT)
+
+def day_number(date):
+    """
+        Days since EPOCH of the 'yyyy-mm-dd' 'date', NO_DATE for anything else
+    """
+    try:
+        return (datetime.date.fromisoformat(date) - EPOCH).days if date and len(date) == 10 else NO_DATE
+    except ValueError:
+        return NO_DATE
+
+def sources(root):
+    """
+        Return { product: csv file } under 'root', the file of a run in '_source' winning over the committed one
+    """
+    found = {}
+    for pattern in ('*/*.csv', '*/_source/*.csv'):
+        for filename in sorted(glob.glob(path.join(glob.escape(root), pattern))):
+            found[path.splitext(path.basename(filename))[0]] = filename
+
+    return found
+
+def dump(histories):
+    """
+        Content of the snapshot of the 'tpvh.lookup.History' 'histories'
+    """
+    records = []
+    keys = []
+    days = array.array('i')
+    versions = array.array('I')
+    offsets = array.array('I', [ 0 ])
+    strings = bytearray()
+    interned = {}
+
+    for history in sorted(histories, key=lambda history: history.product):
+        name = history.product.encode('utf-8')
+        if len(name) > NAME_SIZE:
+            raise ValueError('[!] product name "%s" is too long for the snapshot' % history.product)
+
+        records.append(PRODUCT.pack(name, history.scheme.encode('ascii'), len(versions), len(history.versions)))
+        keys.extend(versionkey.PACKED.pack(*key) for key in history.keys)
+
+        for version, date in zip(history.versions, history.dates):
+            position = interned.get(version)
+            if position is None:
+                position = interned[version] = len(interned)
+                strings += version.encode('utf-8')
+                offsets.append(len(strings))
+
+            versions.append(position)
+            days.append(day_number(date))
+
+    sections = [ b''.join(records), b''.join(keys), days.tobytes(), versions.tobytes(), offsets.tobytes(), bytes(strings) ]
+
+    content = bytearray(HEADER.size)
+    starts = []
+    for section in sections:
+        content += bytes(-len(content) % ALIGNMENT)
+        starts.append(len(content))
+        content += section
+
+    HEADER.pack_into(content, 0, MAGIC, sys.byteorder.encode('ascii'), FORMAT, versionkey.WIDTH, len(records), len(versions), len(interned), 0, *starts)
+
+    return bytes(content), len(records), len(versions)
+
+def write(filename, root):
+    """
+        Write the snapshot of the histories under 'root' to 'filename', return (products, rows)
+    """
+    # the histories are only needed to write a snapshot, not to read one
+    from tpvh import lookup
+
+    histories = [ lookup.read(product, csv_file) for product, csv_file in sorted(sources(root).items()) ]
+    content, products, rows = dump(histories)
+    cache.write_file(filename, content)
+
+    with _lock:
+        _stats.update(filename=filename, products=products, rows=rows, size=len(content))
+
+    print('[+] snapshot "%s" written' % filename)
+
+    return products, rows
+
+def load(filename):
+    """
+        Snapshot of 'filename', mapped in memory
+    """
+    with open(filename, 'rb') as fd:
+        buffer = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        magic, byteorder, file_format, width, product_count, rows, strings, _, *starts = HEADER.unpack_from(buffer)
+    except struct.error:
+        magic = None
+
+    if magic != MAGIC or file_format != FORMAT or width != versionkey.WIDTH:
+        buffer.close()
+        raise ValueError('[!] "%s" is not a snapshot of format %d' % (filename, FORMAT))
+
+    if byteorder.rstrip(b'\0').decode('ascii') != sys.byteorder:
+        buffer.close()
+        raise ValueError('[!] "%s" was written on a %s-endian host' % (filename, byteorder.rstrip(b'\0').decode('ascii')))
+
+    products = {}
+    for position in range(product_count):
+        name, scheme, start, count = PRODUCT.unpack_from(buffer, starts[0] + position * PRODUCT.size)
+        products[name.rstrip(b'\0').decode('utf-8')] = Product(scheme.rstrip(b'\0').decode('ascii'), start, count)
+
+    view = memoryview(buffer)
+    days = view[starts[2]:starts[2] + 4 * rows].cast('i')
+    versions = view[starts[3]:starts[3] + 4 * rows].cast('I')
+    offsets = view[starts[4]:starts[4] + 4 * (strings + 1)].cast('I')
+
+    return Snapshot(filename, products, buffer, starts[1], days, versions, offsets, view[starts[5]:])
+
+def close(snapshot):
+    for view in (snapshot.days, snapshot.versions, snapshot.offsets, snapshot.strings):
+        view.release()
+    snapshot.buffer.close()
+
+def key_at(snapshot, row):
+    """
+        Packed key of 'row', as bytes
+    """
+    start = snapshot.keys + row * versionkey.PACKED.size
+    return snapshot.buffer[start:start + versionkey.PACKED.size]
+
+def version_bytes(snapshot, row):
+    position = snapshot.versions[row]
+    return snapshot.strings[snapshot.offsets[position]:snapshot.offsets[position + 1]]
+
+def version(snapshot, row):
+    return bytes(version_bytes(snapshot, row)).decode('utf-8')
+
+def date(snapshot, row):
+    """
+        Release date of 'row' as 'yyyy-mm-dd', None if it has none
+    """
+    days = snapshot.days[row]
+    return (EPOCH + datetime.timedelta(days=days)).isoformat() if days != NO_DATE else None
+
+def product(snapshot, name):
+    found = snapshot.products.get(name)
+    if found is None:
+        raise KeyError('[!] no history for "%s" in "%s"' % (name, snapshot.filename))
+
+    return found
+
+@functools.lru_cache(maxsize=1 << 16)
+def query_key(scheme, vstring):
+    """
+        Packed key of a queried version, None if 'scheme' cannot read it
+    """
+    try:
+        return versionkey.PACKED.pack(*versionkey.KEY_FUNCTIONS[scheme](vstring))
+    except ValueError:
+        return None
+
+def find(snapshot, name, vstring):
+    """
+        (row of 'vstring' in the history of 'name' or None, number of rows at or below its key)
+    """
+    found = product(snapshot, name)
+    key = query_key(found.scheme, vstring)
+    if key is None:
+        return None, None
+
+    rows = range(found.start, found.start + found.rows)
+    key_of = functools.partial(key_at, snapshot)
+    low = bisect.bisect_left(rows, key, key=key_of)
+    high = bisect.bisect_right(rows, key, lo=low, key=key_of)
+
+    # the first row of a version wins, as in 'tpvh.lookup'
+    encoded = vstring.encode('utf-8')
+    for row in rows[low:high]:
+        if version_bytes(snapshot, row) == encoded:
+            return row, high
+
+    return None, high
+
+def lookup(snapshot, name, vstring):
+    """
+        Release date of 'vstring' of product 'name', None if it is not in its history or has no date
+    """
+    row, below = find(snapshot, name, vstring)
+    return date(snapshot, row) if row is not None else None
+
+def floor(snapshot, name, vstring):
+    """
+        (version, date) of the newest release of 'name' at or below 'vstring', None if there is none
+    """
+    row, below = find(snapshot, name, vstring)
+    if row is None:
+        if not(below):
+            return None
+        row = product(snapshot, name).start + below - 1
+
+    return version(snapshot, row), date(snapshot, row)
+
+def report():
+    with _lock:
+        if not(_stats):
+            return []
+
+        return [ '[+] snapshot: %d versions of %d products in "%s" (%d bytes)' % (_stats['rows'], _stats['products'], _stats['filename'], _stats['size']) ]
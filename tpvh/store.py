@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    Content-addressed store of the raw HTTP responses of a run, and offline replay of a run
+
+    Bodies are stored once under 'objects/' by their sha256, and every run gets a
+    manifest 'runs/<run-id>.json' mapping each url to the hash of the body it got.
+    In replay mode, 'tpvh.fetch.get' answers from a manifest instead of the network,
+    so the parsing and merging of all the scrapers can be run and timed offline.
+"""
+
+from os import path
+import os
+import json
+import time
+import hashlib
+import threading
+
+import requests
+import requests.structures
+
+from tpvh import ROOT_DIR
+from tpvh import cache
+
+STORE_DIR = os.environ.get('TPVH_STORE_DIR', path.join(ROOT_DIR, '.cache', 'store'))
+
+# Response headers worth keeping with a body
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+_lock = threading.Lock()
+_recording = None
+_replaying = None
+
+def new_run_id():
+    return time.strftime('%Y%m%dT%H%M%S')
+
+def object_path(digest):
+    return path.join(STORE_DIR, 'objects', digest[:2], digest)
+
+def manifest_path(run_id):
+    return path.join(STORE_DIR, 'runs', '%s.json' % run_id)
+
+def recording():
+    return _recording is not None
+
+def replaying():
+    return _replaying is not None
+
+def record(run_id=None):
+    """
+        Start storing every response fetched, return the id of the run
+    """
+    global _recording
+    with _lock:
+        _recording = { 'run_id': run_id or new_run_id(), 'started': time.time(), 'urls': {} }
+        return _recording['run_id']
+
+def put(url, response):
+    """
+        Store the body of 'response' and add it to the manifest of the run being recorded
+    """
+    if not(recording()):
+        return
+
+    content = response.content
+    digest = hashlib.sha256(content).hexdigest()
+    filename = object_path(digest)
+    if not(path.isfile(filename)):
+        cache.write_file(filename, content)
+
+    with _lock:
+        _recording['urls'][url] = {
+            'sha256': digest,
+            'status': response.status_code,
+            'headers': { name: response.headers[name] for name in KEPT_HEADERS if name in response.headers },
+        }
+
+def save():
+    """
+        Write the manifest of the run being recorded, return its path
+    """
+    if not(recording()):
+        return None
+
+    with _lock:
+        filename = manifest_path(_recording['run_id'])
+        cache.write_json(filename, _recording)
+
+    return filename
+
+def replay(run_id):
+    """
+        Answer every request from the manifest of 'run_id' from now on
+    """
+    global _replaying
+    filename = manifest_path(run_id)
+    try:
+        with open(filename, 'r', encoding='utf-8') as fd:
+            manifest = json.load(fd)
+    except OSError:
+        raise FileNotFoundError('[!] no stored run "%s" in "%s"' % (run_id, path.join(STORE_DIR, 'runs')))
+
+    with _lock:
+        _replaying = manifest
+
+    return len(manifest['urls'])
+
+def get(url):
+    """
+        Rebuild the response stored for 'url' in the run being replayed
+    """
+    entry = _replaying['urls'].get(url)
+    if entry is None:
+        raise requests.ConnectionError('[!] "%s" was not fetched during run "%s"' % (url, _replaying['run_id']))
+
+    with open(object_path(entry['sha256']), 'rb') as fd:
+        content = fd.read()
+
+    response = requests.Response()
+    response._content = content
+    response.status_code = entry['status']
+    response.headers = requests.structures.CaseInsensitiveDict(entry['headers'])
+    response.url = url
+    response.reason = 'Replayed'
+
+    return response
+
+def started(run_id):
+    """
+        When the run 'run_id' started, the time its manifest was written for older manifests
+    """
+    filename = manifest_path(run_id)
+    try:
+        with open(filename, 'r', encoding='utf-8') as fd:
+            manifest = json.load(fd)
+        return float(manifest['started'])
+    except (KeyError, TypeError, ValueError):
+        return path.getmtime(filename)
+
+def runs():
+    """
+        Ids of the stored runs, oldest first
+
+        Runs are ordered on the time they started, not on their id, which can be given by '--record'.
+    """
+    try:
+        run_ids = [ name[:-len('.json')] for name in os.listdir(path.join(STORE_DIR, 'runs')) if name.endswith('.json') ]
+        return sorted(run_ids, key=lambda run_id: (started(run_id), run_id))
+    except OSError:
+        return []
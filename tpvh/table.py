@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    Output stage of the scrapers: previous file merge, sorting and csv writing
+
+    The output files are ';' separated, every field quoted and lines ending with '\n'.
+    By default the table goes through pandas ('tpvh.frame'); in lean mode it is kept
+    as plain lists and written with the 'csv' module, to the same bytes, so that a
+    scraper started in a short-lived container does not pay for importing pandas.
+"""
+
+from os import path
+import io
+import os
+import csv
+import hashlib
+import threading
+
+from tpvh import cache
+from tpvh import versionkey
+
+# Pandas-free output, set by '--lean' or 'TPVH_LEAN=1'
+LEAN = os.environ.get('TPVH_LEAN', '') not in ('', '0')
+
+_changes = {}
+_lock = threading.Lock()
+
+def read_csv(filename):
+    """
+        Return the (header, rows) of a generated csv file
+    """
+    with open(filename, 'r', encoding='utf-8', newline='') as fd:
+        reader = csv.reader(fd, delimiter=';', quoting=csv.QUOTE_ALL)
+        header = next(reader, [])
+        return header, [ row for row in reader if row ]
+
+def dump_csv(header, rows):
+    """
+        Serialized csv file of 'header' and 'rows'
+    """
+    out = io.StringIO()
+    writer = csv.writer(out, delimiter=';', quoting=csv.QUOTE_ALL, lineterminator='\n')
+    writer.writerow(header)
+    writer.writerows(rows)
+
+    return out.getvalue()
+
+def file_hash(filename):
+    """
+        sha256 of the content of 'filename', None if it cannot be read
+    """
+    try:
+        with open(filename, 'rb') as fd:
+            return hashlib.sha256(fd.read()).hexdigest()
+    except OSError:
+        return None
+
+def write_if_changed(opts, content):
+    """
+        Write the serialized csv 'content' to the output file unless it would not change anything
+
+        The output file is left alone when it already holds 'content', and not created at
+        all in 'previous' mode when 'content' is the previous file. The product counts as
+        changed when 'content' differs from the previous file, or in 'standalone' mode from
+        the former output file. Return whether it changed.
+    """
+    content = content.encode('utf-8')
+    digest = hashlib.sha256(content).hexdigest()
+    target = path.splitext(path.basename(opts.output_file))[0]
+
+    output_hash = file_hash(opts.output_file)
+    if opts.mode == 'previous':
+        changed = file_hash(opts.previous_file) != digest
+    else:
+        changed = output_hash != digest
+
+    if output_hash != digest and (changed or output_hash is not None):
+        cache.write_file(opts.output_file, content)
+        print('[+] "%s" written' % opts.output_file)
+
+    if not(changed):
+        print('[+] no change for "%s"' % target)
+
+    with _lock:
+        _changes[target] = changed
+
+    return changed
+
+def changes():
+    """
+        Return { target: changed } for the files generated so far
+    """
+    with _lock:
+        return dict(_changes)
+
+def report():
+    generated = changes()
+    if not(generated):
+        return []
+
+    changed = sorted(target for target, is_changed in generated.items() if is_changed)
+    return [ '[+] %d of %d products changed: %s' % (len(changed), len(generated), ', '.join(changed) or '-') ]
+
+def sort_rows(rows, scheme=versionkey.LOOSE):
+    """
+        'rows' sorted on their first field, a version
+    """
+    order = versionkey.sort_order([ row[0] for row in rows ], scheme)
+    return [ rows[index] for index in order ]
+
+def insert_rows(previous, rows, scheme=versionkey.LOOSE):
+    """
+        'previous' rows, sorted on their version, with the 'rows' of the versions they lack inserted in order
+    """
+    versions = [ row[0] for row in previous ]
+    positions, indices = versionkey.insertions(versions, [ row[0] for row in rows ], scheme)
+
+    merged = []
+    start = 0
+    for position, index in zip(positions, indices):
+        merged.extend(previous[start:position])
+        merged.append(rows[index])
+        start = position
+    merged.extend(previous[start:])
+
+    return merged
+
+def generate_csv(opts, results, scheme):
+    """
+        Write the { column: values } 'results', merged with the previous file in 'previous' mode
+
+        The resulting table is loaded in the database when there is one, see 'tpvh.database'.
+        Return whether the file changed, see 'write_if_changed'.
+    """
+    changed = write_csv(opts, results, scheme)
+
+    from tpvh import database
+    if database.enabled():
+        # the output file is only left out in 'previous' mode, when it would be the previous file
+        filename = opts.output_file if path.isfile(opts.output_file) else opts.previous_file
+        database.sync(path.splitext(path.basename(opts.output_file))[0], filename, scheme)
+
+    return changed
+
+def write_csv(opts, results, scheme):
+    if not(LEAN):
+        # pandas is only imported outside lean mode
+        from tpvh import frame
+        return frame.generate_csv(opts, results, scheme)
+
+    header = list(results)
+
+    if opts.mode == 'previous':
+        previous_header, previous = read_csv(opts.previous_file)
+        if sorted(previous_header) != sorted(header):
+            print('[!] columns of "%s" differ from %s, using pandas to merge them' % (opts.previous_file, header))
+            from tpvh import frame
+            return frame.generate_csv(opts, results, scheme)
+
+        # the columns keep the order of the previous file, as with pandas
+        header = previous_header
+        rows = [ list(row) for row in zip(*[ results[column] for column in header ]) ]
+        final_rows = insert_rows(previous, rows, scheme)
+    else:
+        rows = [ list(row) for row in zip(*results.values()) ]
+        final_rows = sort_rows(rows, scheme)
+
+    return write_if_changed(opts, dump_csv(header, final_rows))
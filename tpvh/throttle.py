@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    Per-host rate limiting, shared by every source of a run
+
+    Each domain gets a token bucket ('rate' requests per second, up to 'burst' at once)
+    and a cap on the requests in flight. A host matches the most specific configured
+    domain, e.g. 'community.chocolatey.org' is limited by the 'chocolatey.org' entry,
+    so the redirects from chocolatey.org do not get a bucket of their own.
+"""
+
+import time
+import threading
+import collections
+
+HostLimit = collections.namedtuple('HostLimit', ['rate', 'burst', 'inflight'])
+
+# Limits of the domains known to throttle us, anything else gets DEFAULT_LIMIT
+HOST_LIMITS = {
+    'chocolatey.org': HostLimit(rate=2.0, burst=4, inflight=4),
+    'clamav.net': HostLimit(rate=1.0, burst=2, inflight=2),
+    'wikipedia.org': HostLimit(rate=5.0, burst=5, inflight=4),
+    'archive.apache.org': HostLimit(rate=4.0, burst=6, inflight=6),
+    'drupal.org': HostLimit(rate=4.0, burst=4, inflight=4),
+}
+DEFAULT_LIMIT = HostLimit(rate=5.0, burst=5, inflight=6)
+
+class Limiter(object):
+    """
+        Token bucket plus in-flight cap of one domain, used as a context manager around a request
+    """
+    def __init__(self, domain, limit):
+        self.domain = domain
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(limit.inflight)
+
+        self.requests = 0
+        self.waited = 0.0
+        self.throttled = 0
+
+    def take_token(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.limit.burst, self.tokens + (now - self.updated) * self.limit.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.limit.rate
+
+            time.sleep(delay)
+
+    def backoff(self, delay):
+        """
+            The host told us to slow down: empty the bucket for 'delay' seconds
+        """
+        with self.lock:
+            self.throttled += 1
+            self.tokens = min(self.tokens, 0) - delay * self.limit.rate
+
+    def acquire(self):
+        """
+            Take an in-flight slot and a token, the slot being held until 'release'
+        """
+        start = time.monotonic()
+        self.slots.acquire()
+        self.take_token()
+        with self.lock:
+            self.requests += 1
+            self.waited += time.monotonic() - start
+
+    def release(self):
+        self.slots.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def domain_of(host):
+    """
+        Return the configured domain 'host' belongs to, or 'host' itself
+    """
+    host = (host or '').lower()
+    parts = host.split('.')
+    for i in range(len(parts)):
+        candidate = '.'.join(parts[i:])
+        if candidate in HOST_LIMITS:
+            return candidate
+
+    return host
+
+def limiter(host):
+    """
+        Return the limiter shared by every request to the domain of 'host'
+    """
+    domain = domain_of(host)
+    with _limiters_lock:
+        if domain not in _limiters:
+            _limiters[domain] = Limiter(domain, HOST_LIMITS.get(domain, DEFAULT_LIMIT))
+
+        return _limiters[domain]
+
+def configure(domain, rate=None, burst=None, inflight=None):
+    """
+        Override the limits of a domain, before its first request
+    """
+    domain = domain.lower()
+    limit = HOST_LIMITS.get(domain, DEFAULT_LIMIT)
+    limit = limit._replace(**{ key: value for key, value in (('rate', rate), ('burst', burst), ('inflight', inflight)) if value is not None })
+    if limit.rate <= 0 or limit.burst < 1 or limit.inflight < 1:
+        raise ValueError('invalid limits for "%s": %s' % (domain, limit))
+
+    HOST_LIMITS[domain] = limit
+    with _limiters_lock:
+        _limiters.pop(domain, None)
+
+    return limit
+
+def parse_limit(spec):
+    """
+        Parse a 'domain=rate[,inflight[,burst]]' command line specification and apply it
+    """
+    try:
+        domain, values = spec.split('=', 1)
+        values = values.split(',')
+        rate = float(values[0])
+        inflight = int(values[1]) if len(values) > 1 and values[1] else None
+        burst = int(values[2]) if len(values) > 2 and values[2] else None
+    except (ValueError, IndexError):
+        raise ValueError('"%s" is not a valid domain=rate[,inflight[,burst]] limit' % spec)
+
+    return domain, configure(domain, rate=rate, burst=burst, inflight=inflight)
+
+def report():
+    """
+        Return one line per domain hit during the run, with the time spent waiting on its limiter
+    """
+    with _limiters_lock:
+        limiters = sorted(_limiters.values(), key=lambda l: l.domain)
+
+    return [ "[+] %s: %d requests, %.2fs waited, throttled %d times (%.1f req/s, %d in flight)" % (l.domain, l.requests, l.waited, l.throttled, l.limit.rate, l.limit.inflight)
+             for l in limiters ]
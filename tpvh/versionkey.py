@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+    Fixed-width integer sort keys of version strings
+
+    A version string is turned once into a row of WIDTH non-negative int64, which
+    compare in the same order as the version objects the scrapers used to sort with:
+        - 'loose': looseversion.LooseVersion, numbers and strings being split apart,
+          e.g. '1.8.0_281' is [1, 8, 0, '_', 281] and '15.02.1118.007' is [15, 2, 1118, 7]
+        - 'pep440': packaging.version.Version, e.g. '8.0.0-rc1' sorts before '8.0.0'
+    The keys are memoized per scheme and kept on disk from one run to the next. This
+    module only needs the standard library; 'tpvh.frame' sorts whole pandas columns
+    of keys with a single 'numpy.lexsort'.
+"""
+
+from os import path
+import os
+import re
+import json
+import bisect
+import struct
+import threading
+
+from packaging.version import Version
+
+from tpvh import ROOT_DIR
+from tpvh import cache
+
+LOOSE = 'loose'
+PEP440 = 'pep440'
+
+# Components kept in a key, later ones are ignored
+WIDTH = 10
+
+# Bump when the layout of the keys changes, to discard the keys saved on disk
+KEY_FORMAT = 1
+
+KEYS_DIR = os.environ.get('TPVH_KEYS_DIR', path.join(ROOT_DIR, '.cache', 'keys'))
+
+# Loose components: padding < numbers < strings, the type being in the 2 top bits
+END = 0
+NUMBER = 1 << 61
+STRING = 2 << 61
+NUMBER_MAX = NUMBER - 1
+
+# Characters of a string component compared, one byte each
+STRING_CHARS = 7
+
+# pep440 pre-release letters, between the 'no pre-release' markers of packaging
+PRE_DEV_ONLY = 0
+PRE_LETTERS = { 'a': 1, 'b': 2, 'rc': 3 }
+PRE_NONE = 4
+INFINITY = (1 << 63) - 1
+
+COMPONENT_RE = re.compile(r'(\d+ | [a-z]+ | \.)', re.VERBOSE)
+
+_memo = { LOOSE: {}, PEP440: {} }
+_loaded = set()
+_dirty = set()
+_lock = threading.Lock()
+
+def pack_string(component):
+    """
+        First STRING_CHARS characters of 'component' as an integer comparing like the string
+    """
+    packed = 0
+    for char in component[:STRING_CHARS].ljust(STRING_CHARS, '\0'):
+        packed = (packed << 8) | min(ord(char), 0xff)
+
+    return STRING | packed
+
+def loose_key(vstring):
+    """
+        Key of 'vstring' ordered as looseversion.LooseVersion, numbers sorting before strings
+    """
+    key = []
+    for component in COMPONENT_RE.split(vstring):
+        if not(component) or component == '.':
+            continue
+
+        if component.isdecimal():
+            key.append(NUMBER | min(int(component), NUMBER_MAX))
+        else:
+            key.append(pack_string(component))
+
+    key = key[:WIDTH]
+    return key + [END] * (WIDTH - len(key))
+
+def pep440_key(vstring):
+    """
+        Key of 'vstring' ordered as packaging.version.Version, local labels being ignored
+    """
+    parsed = Version(vstring)
+    release = list(parsed.release[:WIDTH - 5])
+    release = release + [0] * (WIDTH - 5 - len(release))
+
+    if parsed.pre is None and parsed.post is None and parsed.dev is not None:
+        pre = [PRE_DEV_ONLY, 0]
+    elif parsed.pre is None:
+        pre = [PRE_NONE, 0]
+    else:
+        pre = [PRE_LETTERS[parsed.pre[0]], parsed.pre[1]]
+
+    post = 0 if parsed.post is None else parsed.post + 1
+    dev = INFINITY if parsed.dev is None else parsed.dev
+
+    return [parsed.epoch] + release + pre + [post, dev]
+
+KEY_FUNCTIONS = { LOOSE: loose_key, PEP440: pep440_key }
+
+# Scheme of the products not sorted with 'loose'
+SCHEMES = { 'drupal': PEP440, 'firefox': PEP440, 'postgres': PEP440 }
+
+def scheme_of(target):
+    return SCHEMES.get(target, LOOSE)
+
+def keys_path(scheme):
+    return path.join(KEYS_DIR, '%s.json' % scheme)
+
+def load(scheme):
+    """
+        Merge the keys saved by a previous run into the memo of 'scheme', once per process
+    """
+    if scheme in _loaded:
+        return
+
+    _loaded.add(scheme)
+    if not(KEYS_DIR):
+        return
+
+    try:
+        with open(keys_path(scheme), 'r', encoding='utf-8') as fd:
+            saved = json.load(fd)
+    except (OSError, ValueError):
+        return
+
+    if saved.get('format') == KEY_FORMAT and saved.get('width') == WIDTH:
+        _memo[scheme].update(saved['keys'])
+
+def save(scheme):
+    if KEYS_DIR:
+        cache.write_json(keys_path(scheme), { 'format': KEY_FORMAT, 'width': WIDTH, 'keys': _memo[scheme] })
+
+def key_lists(versions, scheme=LOOSE):
+    """
+        Keys of 'versions' as lists of WIDTH int, comparing like the rows of 'keys'
+    """
+    key_function = KEY_FUNCTIONS[scheme]
+    with _lock:
+        load(scheme)
+        memo = _memo[scheme]
+        rows = []
+        for vstring in versions:
+            key = memo.get(vstring)
+            if key is None:
+                key = memo[vstring] = key_function(vstring)
+                _dirty.add(scheme)
+            rows.append(key)
+
+    return rows
+
+# Key as WIDTH big-endian uint64: bytes compare like the keys, e.g. as an SQLite BLOB
+PACKED = struct.Struct('>%dQ' % WIDTH)
+
+def packed_keys(versions, scheme=LOOSE):
+    """
+        Keys of 'versions' packed as bytes of PACKED.size, comparing bytewise like the keys
+    """
+    packed = [ PACKED.pack(*key) for key in key_lists(versions, scheme) ]
+    flush(scheme)
+
+    return packed
+
+def flush(scheme):
+    """
+        Save the keys of 'scheme' if new ones were computed
+    """
+    with _lock:
+        if scheme in _dirty:
+            _dirty.discard(scheme)
+            save(scheme)
+
+def sort_order(versions, scheme=LOOSE):
+    """
+        Indices sorting 'versions' in ascending order, equal keys keeping their order
+    """
+    version_keys = key_lists(versions, scheme)
+    flush(scheme)
+
+    return sorted(range(len(version_keys)), key=version_keys.__getitem__)
+
+def insertions(versions, new_versions, scheme=LOOSE):
+    """
+        Where to insert 'new_versions' into the sorted 'versions', as (positions, indices)
+
+        'indices' are those of the new versions missing from 'versions', in the order
+        they go in, and 'positions' the index of 'versions' each one goes before. Only
+        the keys of the new versions and of the O(log n) versions the bisections look
+        at are computed.
+    """
+    old_key = lambda position: key_lists([versions[position]], scheme)[0]
+    new_keys = key_lists(new_versions, scheme)
+
+    positions = []
+    indices = []
+    for index in sorted(range(len(new_versions)), key=new_keys.__getitem__):
+        low = bisect.bisect_left(range(len(versions)), new_keys[index], key=old_key)
+        high = bisect.bisect_right(range(len(versions)), new_keys[index], lo=low, key=old_key)
+        if new_versions[index] in list(versions[low:high]):
+            continue
+
+        positions.append(high)
+        indices.append(index)
+
+    flush(scheme)
+
+    return positions, indices
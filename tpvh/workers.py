@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of third-parties-version-history.
+#
+# Copyright (C) 2026, Thomas Debize <tdebize at mail.com>
+# All rights reserved.
+#
+# third-parties-version-history is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# third-parties-version-history is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with third-parties-version-history.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+    Process pool parse stage
+
+    Parsing is CPU bound and holds the GIL, soupparser being pure Python: on threads,
+    the pages of concurrent sources are parsed one at a time. With 'PROCESSES' set
+    ('--processes' or 'TPVH_PROCESSES'), 'tpvh.fetch.scrape' keeps downloading on
+    threads and hands the bodies over to a pool of processes, which import the
+    scraper defining the 'parse_*' function of the source, run it and send back its
+    rows as compact (version, date, extra) tuples. A parser can also be a partial of
+    a module level function, e.g. the one of a chocolatey package. Such pages are
+    downloaded whole instead of being streamed; parsers that are not module level
+    functions are still parsed in the calling thread.
+"""
+
+from os import path
+import os
+import threading
+import importlib.util
+import multiprocessing
+import concurrent.futures
+
+from tpvh import cache
+from tpvh import parsing
+
+# Parse processes, 0 to parse on the threads of the sources
+PROCESSES = int(os.environ.get('TPVH_PROCESSES', '') or 0)
+
+_pool = None
+_modules = {}
+_stats = { 'pages': 0 }
+_lock = threading.Lock()
+
+def enabled():
+    return PROCESSES > 0
+
+def can_run(parse):
+    """
+        Whether a worker can find 'parse' again, by its name in the file defining it and its arguments
+    """
+    function = cache.parser_parts(parse)[0]
+    if getattr(parse, 'keywords', None):
+        return False
+
+    return function.__qualname__ == function.__name__ and path.isfile(function.__code__.co_filename)
+
+def pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            # threads of the parent are not forked along, spawned workers start from a clean state
+            _pool = concurrent.futures.ProcessPoolExecutor(max_workers=PROCESSES, mp_context=multiprocessing.get_context('spawn'))
+
+        return _pool
+
+def shutdown():
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+def load(filename):
+    """
+        Module of the scraper 'filename' in a worker, imported once
+    """
+    if filename not in _modules:
+        name = 'tpvh_worker_%d' % len(_modules)
+        spec = importlib.util.spec_from_file_location(name, filename)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[filename] = module
+
+    return _modules[filename]
+
+def compact(version, item):
+    extra = tuple((key, value) for key, value in item.items() if key != 'date')
+    return version, item.get('date'), extra
+
+def expand(row):
+    version, date, extra = row
+    item = dict(extra)
+    if date is not None:
+        item['date'] = date
+
+    return version, item
+
+def run(filename, name, args, content):
+    """
+        Worker side: compact rows of 'content' parsed by the function 'name' of 'filename', and the parsing backends used
+    """
+    parsing.reset()
+    parse = getattr(load(filename), name)
+    rows = [ compact(version, item) for version, item in parse(*args, content) ]
+
+    return rows, parsing.backends()
+
+def submit(parse, content):
+    """
+        Parse 'content' with 'parse' in a worker, return a future of its (version, item) rows
+    """
+    future = concurrent.futures.Future()
+
+    def done(worker_future):
+        try:
+            rows, backends = worker_future.result()
+        except BaseException as e:
+            future.set_exception(e)
+            return
+
+        for source, counter in backends.items():
+            for backend, pages in counter.items():
+                parsing.count(source, backend, pages)
+        with _lock:
+            _stats['pages'] += 1
+        future.set_result([ expand(row) for row in rows ])
+
+    function, args = cache.parser_parts(parse)
+    pool().submit(run, function.__code__.co_filename, function.__name__, args, content).add_done_callback(done)
+
+    return future
+
+def report():
+    with _lock:
+        return [ '[+] parse workers: %d pages parsed in %d processes' % (_stats['pages'], PROCESSES) ] if _stats['pages'] else []